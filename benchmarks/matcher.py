@@ -0,0 +1,62 @@
+"""
+Keyword matcher throughput benchmark.
+
+Compares `PhraseMatcher` against the per-phrase `phrase in title` scan it
+replaced, for a growing number of watched phrases.
+
+Usage:
+    $ python -m benchmarks.matcher
+"""
+import random
+import string
+import time
+
+from cogs.utils.matcher import PhraseMatcher
+
+TITLES = 2000
+PHRASE_COUNTS = (10, 100, 1000, 5000)
+
+
+def _word(rng, low=3, high=9):
+    length = rng.randint(low, high)
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(length))
+
+
+def _titles(rng):
+    return [
+        " ".join(_word(rng) for _ in range(rng.randint(6, 16))) for _ in range(TITLES)
+    ]
+
+
+def _timed(func, titles):
+    start = time.perf_counter()
+    matches = sum(len(func(x)) for x in titles)
+    return time.perf_counter() - start, matches
+
+
+def main():
+    rng = random.Random(0)
+    titles = _titles(rng)
+    print(f"{'phrases':>8} {'automaton/s':>12} {'linear/s':>12} {'speedup':>8}")
+    for count in PHRASE_COUNTS:
+        phrases = {_word(rng): i % 300 for i in range(count)}
+        matcher = PhraseMatcher()
+        for phrase, user in phrases.items():
+            matcher.add(phrase, user)
+        matcher.match("")
+
+        def linear(title):
+            title = title.lower()
+            return {user for phrase, user in phrases.items() if phrase in title}
+
+        automaton_time, automaton_matches = _timed(matcher.match, titles)
+        linear_time, linear_matches = _timed(linear, titles)
+        assert automaton_matches == linear_matches
+        print(
+            f"{count:>8} {TITLES / automaton_time:>12.0f} {TITLES / linear_time:>12.0f}"
+            f" {linear_time / automaton_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Cold start import-time benchmark.
+
+Imports `bot` and the enabled cog extensions in a fresh interpreter with
+`-X importtime`, reports the slowest top-level imports and exits non-zero if
+the total import time is over budget.
+
+Usage:
+    $ python -m benchmarks.startup
+    $ python -m benchmarks.startup --cogs general,weather --budget 800
+    $ python -m benchmarks.startup --output logs/importtime.txt
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+# `settings` needs a guild ID to import, the benchmark never connects.
+os.environ.setdefault("DISCORD_GUILD_ID", "0")
+
+import settings  # noqa: E402
+
+RUNS = 5
+TOP = 15
+
+
+def _import_times(cogs):
+    """Import `bot` and `cogs` in a fresh interpreter.
+
+    Returns:
+        result (tuple): Raw `-X importtime` output and `(cumulative_us, module)`
+                        for every top-level import.
+    """
+    modules = ["bot"] + [f"cogs.{x}" for x in cogs]
+    code = "import importlib\n" + "".join(
+        f"importlib.import_module({x!r})\n" for x in modules
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=settings.ROOT_DIR,
+        env=os.environ.copy(),
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line[len("import time:") :].split("|")
+        if not cumulative.strip().isdigit() or module.startswith("  "):
+            continue
+        imports.append((int(cumulative), module.strip()))
+    return result.stderr, imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cogs", default=",".join(settings.ENABLED_COGS))
+    parser.add_argument("--budget", type=float, default=settings.IMPORT_TIME_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=RUNS)
+    parser.add_argument("--output", help="write the fastest run's raw output here")
+    args = parser.parse_args()
+    cogs = [x.strip() for x in args.cogs.split(",") if x.strip()]
+
+    # The fastest run is the least disturbed by the rest of the machine.
+    raw, imports = min(
+        (_import_times(cogs) for _ in range(args.runs)),
+        key=lambda x: sum(us for us, _ in x[1]),
+    )
+    total_ms = sum(us for us, _ in imports) / 1000
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(raw)
+
+    print(f"cogs: {', '.join(cogs) or 'none'}")
+    print(f"{'ms':>9}  module")
+    for us, module in sorted(imports, reverse=True)[:TOP]:
+        print(f"{us / 1000:>9.1f}  {module}")
+    print(f"{total_ms:>9.1f}  total (budget {args.budget:.0f} ms)")
+    if total_ms > args.budget:
+        print("FAIL: cold start import time is over budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
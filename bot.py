@@ -1,11 +1,9 @@
+import logging
+
 import discord
 
 import settings
 from brandobot.brando import BrandoBot
-from cogs.general import GeneralCog
-from cogs.reddit import RedditCog
-from cogs.twitter import TwitterCog
-from cogs.weather import WeatherCog
 
 # register intents
 intents = discord.Intents.default()
@@ -14,13 +12,16 @@ intents.members = True
 
 def main():
 
-    bot = BrandoBot(command_prefix="!", intents=intents)
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    bot = BrandoBot(
+        command_prefix="!", intents=intents, member_cache=settings.MEMBER_CACHE_POLICY
+    )
 
-    # add cogs
-    bot.add_cog(GeneralCog(bot))
-    bot.add_cog(TwitterCog(bot))
-    bot.add_cog(RedditCog(bot))
-    bot.add_cog(WeatherCog(bot))
+    # load enabled cogs, provider SDKs are only imported for these
+    for name in settings.ENABLED_COGS:
+        bot.load_extension(f"cogs.{name}")
 
     bot.run(settings.DISCORD_TOKEN)
 
@@ -1,7 +1,35 @@
+import asyncio
+import logging
+import resource
+import sys
+import time
+
 import discord
 from discord.ext import commands
 
 import settings
+from cogs.utils.lifecycle import ReadyCog, WarmingUp
+from cogs.utils.ratelimit import RateLimited
+from cogs.utils.sender import MessageScheduler
+
+log = logging.getLogger(__name__)
+
+MEMBER_CACHE_POLICIES = ("full", "seen", "none")
+
+
+def resident_memory():
+    """Resident set size of the process in MiB.
+
+    Falls back to the peak resident size where `/proc` is unavailable.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / 2 ** 20
+    except OSError:
+        # `ru_maxrss` is in KiB on Linux and in bytes on macOS.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (2 ** 20 if sys.platform == "darwin" else 2 ** 10)
 
 
 class BrandoBot(commands.Bot):
@@ -9,25 +37,164 @@ class BrandoBot(commands.Bot):
 
     The more carefully you scheme, the more
     unexpected events come along.
+
+    Guilds are never chunked while connecting, so (re)connects do not wait
+    for the member list. How members are cached is set by `member_cache`:
+
+    - "full": every member is cached, guilds are chunked in the background
+      after the bot is ready.
+    - "seen": only members who invoke a command are cached.
+    - "none": no members are cached, commands fetch them on demand.
+
+    Cogs with remote setup (`ReadyCog`) are set up concurrently right after
+    login, while the gateway connects, and answer "warming up" until ready.
+
+    Attributes:
+        outbox: MessageScheduler (class `MessageScheduler`)
+            Central outbound message queue shared by every cog.
+        member_cache (str): The member cache policy.
+        connection_stats (dict): Time taken by the last connect or resume, and
+                                resident memory once connected and once chunked.
     """
 
+    def __init__(self, *args, member_cache: str = "full", **kwargs):
+        if member_cache not in MEMBER_CACHE_POLICIES:
+            raise ValueError(f"Unknown member cache policy: {member_cache}")
+        intents = kwargs.get("intents") or discord.Intents.default()
+        if member_cache == "full":
+            flags = discord.MemberCacheFlags.from_intents(intents)
+        else:
+            flags = discord.MemberCacheFlags.none()
+        kwargs.setdefault("member_cache_flags", flags)
+        kwargs.setdefault("chunk_guilds_at_startup", False)
+        super().__init__(*args, **kwargs)
+        self.outbox = MessageScheduler()
+        self.member_cache = member_cache
+        self.connection_stats = {}
+        self._connecting_since = time.monotonic()
+        self._chunking = None
+        self._cog_setup = None
+        if member_cache == "seen":
+            self.before_invoke(self._remember_author)
+
+    async def login(self, *args, **kwargs):
+        """Log in, then start every cog's remote setup in the background."""
+        await super().login(*args, **kwargs)
+        if self._cog_setup is None:
+            self._cog_setup = self.loop.create_task(self.setup_cogs())
+
+    def add_cog(self, cog):
+        super().add_cog(cog)
+        # Cogs added after login are set up straight away.
+        if self._cog_setup is not None and isinstance(cog, ReadyCog):
+            self.loop.create_task(cog.start_setup())
+
+    async def setup_cogs(self):
+        """Run the remote setup of every `ReadyCog` concurrently."""
+        started = time.monotonic()
+        cogs = [x for x in self.cogs.values() if isinstance(x, ReadyCog)]
+        await asyncio.gather(*(x.start_setup() for x in cogs))
+        log.info(
+            "Set up %d cogs in %.2fs (%s)",
+            len(cogs),
+            time.monotonic() - started,
+            ", ".join(f"{x.qualified_name} {x.setup_seconds}s" for x in cogs),
+        )
+
+    async def on_command_error(self, ctx, error):
+        """Reply at once when a cog is warming up or a provider is rate limited."""
+        if isinstance(getattr(error, "original", error), (WarmingUp, RateLimited)):
+            await ctx.send(str(getattr(error, "original", error)))
+            return
+        await super().on_command_error(ctx, error)
+
+    async def _remember_author(self, ctx):
+        """Cache the invoking member under the "seen" policy."""
+        author = ctx.author
+        if (
+            ctx.guild is not None
+            and isinstance(author, discord.Member)
+            and ctx.guild.get_member(author.id) is None
+        ):
+            # The same private hook discord.py's own member cache uses.
+            ctx.guild._add_member(author)
+
+    async def on_disconnect(self):
+        if self._connecting_since is None:
+            self._connecting_since = time.monotonic()
+
+    async def on_resumed(self):
+        self._connected("resumed")
+
+    def _connected(self, how: str):
+        """Record and log how long the last (re)connect took."""
+        elapsed = 0.0
+        if self._connecting_since is not None:
+            elapsed = time.monotonic() - self._connecting_since
+        self._connecting_since = None
+        self.connection_stats.update(
+            event=how,
+            seconds=round(elapsed, 2),
+            memory_mib=round(resident_memory(), 1),
+        )
+        log.info(
+            "Connection %s in %.2fs, resident memory %.1f MiB",
+            how,
+            elapsed,
+            self.connection_stats["memory_mib"],
+        )
+
+    async def _chunk_guilds(self):
+        """Fill the member cache of every guild, one guild at a time.
+
+        Chunk responses do not fire member events, so a `guild_chunked` event
+        is dispatched once each guild is filled.
+        """
+        started = time.monotonic()
+        for guild in self.guilds:
+            if not guild.chunked:
+                await guild.chunk()
+                self.dispatch("guild_chunked", guild)
+        self.connection_stats.update(
+            chunk_seconds=round(time.monotonic() - started, 2),
+            chunked_memory_mib=round(resident_memory(), 1),
+        )
+        log.info(
+            "Cached %d members in %.2fs, resident memory %.1f MiB",
+            sum(len(x.members) for x in self.guilds),
+            self.connection_stats["chunk_seconds"],
+            self.connection_stats["chunked_memory_mib"],
+        )
+
     async def on_ready(self):
         """Logging information to server on startup.
 
-        Logs information about the bot and the guild to the terminal.
+        Logs summary counts about the bot and the guild, never the members
+        themselves, and starts background chunking under the "full" policy.
 
         Returns:
             message (class Message): A message with the `user`, `guild.name`,
-                                    `guild.id`, and guild `members`.
+                                    `guild.id`, and guild member counts.
         """
         guild = self.get_guild(id=settings.DISCORD_GUILD_ID)
-        print(f"{self.user} has connected to Discord")
-        print(
-            f"{self.user} is connected to the following guild:\n"
-            f"{guild.name}(id: {guild.id})\n"
+        log.info("%s has connected to Discord", self.user)
+        log.info(
+            "%s is connected to %s (id: %s): %s members (%d cached, policy %s), "
+            "%d channels, %d roles",
+            self.user,
+            guild.name,
+            guild.id,
+            guild.member_count,
+            len(guild.members),
+            self.member_cache,
+            len(guild.channels),
+            len(guild.roles),
         )
-        members = "\n - ".join([member.name for member in guild.members])
-        print(f"Guild Members:\n - {members}")
+        self._connected("ready")
+        if self.member_cache == "full" and (
+            self._chunking is None or self._chunking.done()
+        ):
+            self._chunking = self.loop.create_task(self._chunk_guilds())
         await self.change_presence(
             activity=discord.Activity(
                 name="your every move Joestar! Use !help for a list of commands",
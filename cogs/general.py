@@ -1,14 +1,26 @@
+import asyncio
+
 import discord
 from discord.ext import commands
 
+from cogs.utils.directory import DirectoryIndex
 from cogs.utils.helpers import Helpers
+from cogs.utils.pages import LazyTextPageSource, paginate
 
 
 class GeneralCog(commands.Cog):
-    """General commands available outside specific modules."""
+    """General commands available outside specific modules.
+
+    Attributes:
+        bot: BrandoBot (class `BrandoBot`)
+            Instance of the BrandoBot client.
+        directory: DirectoryIndex (class `DirectoryIndex`)
+            Per-guild name indexes kept current from gateway events.
+    """
 
     def __init__(self, bot):
         self.bot = bot
+        self.directory = DirectoryIndex()
 
     @commands.command()
     async def create_role(self, ctx, role_name: str, hoist=True):
@@ -39,13 +51,18 @@ class GeneralCog(commands.Cog):
 
         Returns:
             role (class Role): Adds a role to the `Member`.
-
-        TODO:
-            * ensure it will find the role
         """
-        user = ctx.message.author
-        role = discord.utils.get(ctx.guild.roles, name=role_name)
-        await user.add_roles(member, role)
+        roles = self.directory.get(ctx.guild).roles
+        role = roles.get(role_name)
+        if role is None:
+            similar = ", ".join(x.name for x in roles.search(role_name[:3], limit=5))
+            await ctx.send(
+                f"Could not find role: {role_name}."
+                + (f" Did you mean: {similar}?" if similar else "")
+            )
+            return
+        await member.add_roles(role)
+        await ctx.send(f"Added role {role.name} to {member.display_name}")
 
     @commands.command()
     async def create_channel(
@@ -63,7 +80,7 @@ class GeneralCog(commands.Cog):
         Returns:
             channel (class TextChannel or VoiceChannel): The channel created.
         """
-        category = discord.utils.get(ctx.guild.categories, name=category_name)
+        category = self.directory.get(ctx.guild).categories.get(category_name)
         if category is None:
             category = await ctx.guild.create_category_channel(name=category_name)
         if channel_type == "text":
@@ -88,7 +105,7 @@ class GeneralCog(commands.Cog):
         Returns:
             category (class CategoryChannel): The category created.
         """
-        category = discord.utils.get(ctx.guild.categories, name=category_name)
+        category = self.directory.get(ctx.guild).categories.get(category_name)
         if category is None:
             await ctx.guild.create_category_channel(name=category_name)
             await ctx.send(f"Created category: {category_name}")
@@ -104,11 +121,9 @@ class GeneralCog(commands.Cog):
         Returns:
             message (class Message): List of Role.name values.
         """
-        roles = "\n -".join([x.name for x in ctx.guild.roles])
-        roles = Helpers.break_message(roles)
-        await ctx.send("Current roles: \n")
-        for x in roles:
-            await ctx.send(x)
+        roles = self.directory.get(ctx.guild).roles
+        roles = Helpers.break_message(f" -{x.name}" for x in roles)
+        await self._send_chunks(ctx, ("Current roles: \n", roles))
 
     @commands.command()
     async def list_channels(self, ctx):
@@ -119,18 +134,18 @@ class GeneralCog(commands.Cog):
         Returns:
             message (class Message): List of channel names by type.
         """
-        text_channels = "\n".join([channel.name for channel in ctx.guild.text_channels])
-        voice_channels = "\n".join(
-            [channel.name for channel in ctx.guild.voice_channels]
+        directory = self.directory.get(ctx.guild)
+        text_channels = Helpers.break_message(
+            channel.name for channel in directory.text_channels
+        )
+        voice_channels = Helpers.break_message(
+            channel.name for channel in directory.voice_channels
+        )
+        await self._send_chunks(
+            ctx,
+            ("Text channels: \n", text_channels),
+            ("Voice channels: \n", voice_channels),
         )
-        text_channels = Helpers.break_message(text_channels)
-        voice_channels = Helpers.break_message(voice_channels)
-        await ctx.send("Text channels: \n")
-        for x in text_channels:
-            await ctx.send(x)
-        await ctx.send("Voice channels: \n")
-        for x in voice_channels:
-            await ctx.send(x)
 
     @commands.command()
     async def list_categories(self, ctx):
@@ -141,23 +156,131 @@ class GeneralCog(commands.Cog):
         Returns:
             message (class Message): List of category names.
         """
-        categories = "\n".join([category.name for category in ctx.guild.categories])
-        categories = Helpers.break_message(categories)
-        await ctx.send("List of categories: \n")
-        for x in categories:
-            await ctx.send(x)
+        categories = Helpers.break_message(
+            category.name for category in self.directory.get(ctx.guild).categories
+        )
+        await self._send_chunks(ctx, ("List of categories: \n", categories))
 
     @commands.command()
     async def list_members(self, ctx):
         """List members of the guild.
 
-        Sends a list of guild members.
+        Sends a list of guild members. Members are fetched on demand unless
+        the bot caches every member.
 
         Returns:
-            message (class Message): List of member names.
+            message (class Message): Paginated list of member names.
         """
-        members = "\n".join([member.name for member in ctx.guild.members])
-        members = Helpers.break_message(members)
-        await ctx.send("Members list: \n")
-        for x in members:
-            await ctx.send(x)
+        if self.bot.member_cache == "full":
+            names = (member.name for member in self.directory.get(ctx.guild).members)
+            members = Helpers.break_message(names, limit=1900)
+        else:
+            # Streamed, only the pages that are viewed are ever fetched.
+            names = (x.name async for x in ctx.guild.fetch_members(limit=None))
+            members = Helpers.break_message_async(names, limit=1900)
+        await paginate(ctx, LazyTextPageSource(members, header="Members list: \n"))
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role):
+        self.directory.role_changed(role)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before, after):
+        self.directory.role_changed(after)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        self.directory.role_changed(role, deleted=True)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        self.directory.channel_changed(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        self.directory.channel_changed(after)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        self.directory.channel_changed(channel, deleted=True)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        self.directory.member_changed(member)
+
+    @commands.Cog.listener()
+    async def on_command(self, ctx):
+        # Members are only cached once seen under the "seen" policy.
+        if self.bot.member_cache == "seen" and isinstance(ctx.author, discord.Member):
+            if ctx.author not in self.directory.get(ctx.guild).members:
+                self.directory.member_changed(ctx.author)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before, after):
+        if before.nick != after.nick:
+            self.directory.member_changed(after)
+
+    @commands.Cog.listener()
+    async def on_user_update(self, before, after):
+        if before.name == after.name:
+            return
+        for guild in self.bot.guilds:
+            member = guild.get_member(after.id)
+            if member is not None:
+                self.directory.member_changed(member)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        self.directory.member_changed(member, left=True)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.directory.drop(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_chunked(self, guild):
+        # A directory built before chunking finished is missing members.
+        self.directory.drop(guild)
+
+    @commands.command(hidden=True)
+    async def startup_stats(self, ctx):
+        """Last (re)connect time and resident memory.
+
+        Returns:
+            message (class Message): Member cache policy, connect or resume time,
+                                    and resident memory.
+        """
+        stats = {"member_cache": self.bot.member_cache, **self.bot.connection_stats}
+        stats = "\n".join(f"{k}: {v}" for k, v in stats.items())
+        await ctx.send(f"**Startup:**\n```{stats}```")
+
+    @commands.command(hidden=True)
+    async def outbox_stats(self, ctx):
+        """Outbound message queue statistics.
+
+        Returns:
+            message (class Message): Queue depth, sent, merged and failed messages,
+                                    and send latency.
+        """
+        stats = "\n".join(f"{k}: {v}" for k, v in self.bot.outbox.stats().items())
+        await ctx.send(f"**Outbox:**\n```{stats}```")
+
+    async def _send_chunks(self, ctx, *sections):
+        """Queue headers and their chunks through the outbox.
+
+        Small adjacent chunks are merged into fewer messages by the outbox.
+
+        Parameters:
+            sections (tuple): `(header, chunks)` pairs sent in order, where
+                            `chunks` are message-sized pieces of text.
+        """
+        sent = []
+        for header, chunks in sections:
+            sent.append(self.bot.outbox.enqueue(ctx.channel, header))
+            sent.extend(self.bot.outbox.enqueue(ctx.channel, x) for x in chunks)
+        await asyncio.gather(*sent)
+
+
+def setup(bot):
+    """Extension entry point, called by `bot.load_extension`."""
+    bot.add_cog(GeneralCog(bot))
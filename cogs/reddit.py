@@ -1,13 +1,18 @@
 from datetime import datetime
 
 import discord
-import praw
 from discord.ext import commands
+from praw.models import MoreComments
 
 import settings
+from cogs.utils.cache import TTLCache
+from cogs.utils.lifecycle import ReadyCog
+from cogs.utils.pages import EmbedPageSource, paginate
+from cogs.utils.reddit import CommentWalker, ListingCache, RedditClient
+from cogs.utils.streams import SubredditStreamManager
 
 
-class RedditCog(commands.Cog):
+class RedditCog(ReadyCog):
     """Reddit functionality.
 
     This cog is used to provide Reddit functionality.
@@ -15,14 +20,6 @@ class RedditCog(commands.Cog):
     The `ctx` argument is treated as `self` for commands and is omitted from documentation.
     """
 
-    reddit = praw.Reddit(
-        client_id=settings.REDDIT_CLIENT_ID,
-        client_secret=settings.REDDIT_CLIENT_SECRET,
-        username=settings.REDDIT_USERNAME,
-        password=settings.REDDIT_PASSWORD,
-        user_agent=settings.REDDIT_USER_AGENT,
-    )
-
     def __init__(self, bot):
         """Reddit Authentication and bot extension.
 
@@ -31,11 +28,46 @@ class RedditCog(commands.Cog):
         Attributes:
             bot: BrandoBot (class `BrandoBot`)
                 Instance of the BrandoBot client.
-            reddit: praw.Reddit (class `Reddit`)
-                Instance of PRAW Reddit API.
+            client: RedditClient (class `RedditClient`)
+                Shared PRAW client, every Reddit call runs on its worker pool.
+            listings: ListingCache (class `ListingCache`)
+                Cached subreddit listings, shared by every listing command.
+            streams: SubredditStreamManager (class `SubredditStreamManager`)
+                One shared background stream per subscribed subreddit.
+            comment_cursors: TTLCache (class `TTLCache`)
+                Each user's unfinished comment walk for `pm_next_comments`.
         """
         self.bot = bot
-        self.reddit = RedditCog.reddit
+        self.client = RedditClient.for_bot(bot)
+        self.listings = ListingCache(
+            self.client,
+            RedditCog._structure_posts,
+            maxsize=settings.REDDIT_LISTING_CACHE_SIZE,
+        )
+        self.streams = SubredditStreamManager(
+            bot,
+            self.client,
+            RedditCog._structure_posts,
+            interval=settings.REDDIT_STREAM_INTERVAL,
+            seen_size=settings.REDDIT_STREAM_SEEN_SIZE,
+        )
+        self.comment_cursors = TTLCache(maxsize=256, ttl=900, stale_ttl=0)
+
+    async def async_setup(self):
+        """Authenticate a Reddit worker before commands are accepted."""
+        self.client.label.set("setup")
+        await self.client.run(lambda reddit: reddit.user.me())
+
+    async def cog_before_invoke(self, ctx):
+        """Count Reddit requests made by the command against its name."""
+        self.client.track(ctx.command.qualified_name)
+
+    def cog_unload(self):
+        """Stop streams and shut down the Reddit worker pool when the cog is removed."""
+        super().cog_unload()
+        self.streams.close()
+        self.client.close()
+        self.bot.reddit_client = None
 
     @commands.command()
     async def random_sub(self, ctx):
@@ -44,14 +76,13 @@ class RedditCog(commands.Cog):
         Gets hot posts from random subreddit.
 
         Returns:
-            message (class Embed): A series of embedded messages with `Submission` content.
+            message (class Embed): A paginated embedded message with `Submission` content.
         """
-        random_sub = self.reddit.random_subreddit()
-        content = random_sub.hot(limit=5)
-        posts = RedditCog._structure_posts(content)
-
-        for x in posts:
-            await ctx.send(f"{x}")
+        sub = await self.client.run(
+            lambda reddit: reddit.random_subreddit().display_name
+        )
+        posts = await self.listings.posts(sub, "hot", 5)
+        await paginate(ctx, EmbedPageSource(posts))
 
     @commands.command()
     async def pm_random_sub(self, ctx):
@@ -60,44 +91,70 @@ class RedditCog(commands.Cog):
         Gets hot posts from random subreddit as a Discord DM.
 
         Returns:
-            message (class Embed): A series of embedded messages with `Submission` content.
+            message (class Embed): A paginated embedded message with `Submission` content.
         """
-        random_sub = self.reddit.random_subreddit()
-        content = random_sub.hot(limit=5)
-        posts = RedditCog._structure_posts(content)
-
-        for x in posts:
-            await ctx.author.send(f"{x}")
+        sub = await self.client.run(
+            lambda reddit: reddit.random_subreddit().display_name
+        )
+        posts = await self.listings.posts(sub, "hot", 5)
+        await paginate(ctx, EmbedPageSource(posts), dm=True)
 
     @commands.command()
     async def pm_stream_sub(self, ctx, sub: str, phrase: str = None):
-        """PM a stream of `Submission`s from a `Subreddit`.
+        """Subscribe to a stream of `Submission`s from a `Subreddit`.
 
-        Sends a stream of `Submission` objects as Discord DMs.
-        Optionally, you can provide a search phrase that will send a single
-        DM with that object once a title containing that phrase is found.
+        Sends new `Submission` objects from the subreddit as Discord DMs until you
+        unsubscribe with `!pm_unstream_sub <sub>`. Optionally, you can provide a
+        search phrase so only posts whose title or body contain it are sent.
+        Run the command again to watch more phrases on the same subreddit.
+        One stream is shared by every subscriber of a subreddit.
 
         Parameters:
             sub (str): The `Subreddit` name to stream.
             phrase (str): Default `None`, multi-word phrases require quotations ("").
         Results:
             message (class Embed): A series of embedded messages with `Submission` content.
-        TODO:
-            * Stop sending duplicates of everything. WTF.
         """
-        subreddit = self.reddit.subreddit(sub)
-        posts = []
-        for x in subreddit.stream.submissions():
-            if phrase:
-                if phrase in x.title.lower():
-                    posts.append(x)
-                    break
-            while len(posts) < 10:
-                posts.append(x)
-                print(len(posts))
-        content = RedditCog._structure_posts(posts)
-        for x in content:
-            await ctx.author.send(embed=x)
+        self.streams.subscribe(sub, ctx.author.id, phrase)
+        await ctx.author.send(
+            f"Subscribed to r/{sub}"
+            + (f' for "{phrase}"' if phrase else "")
+            + f". Use `!pm_unstream_sub {sub}` to stop."
+        )
+
+    @commands.command()
+    async def pm_unstream_sub(self, ctx, sub: str, phrase: str = None):
+        """Unsubscribe from a `Subreddit` stream.
+
+        Parameters:
+            sub (str): The `Subreddit` name to stop streaming.
+            phrase (str): Default `None` removes the subscription, otherwise only
+                        stop watching this phrase.
+        Results:
+            message (class Message): Unsubscribe confirmation.
+        """
+        target = f'"{phrase}" on r/{sub}' if phrase else f"r/{sub}"
+        if self.streams.unsubscribe(sub, ctx.author.id, phrase):
+            await ctx.author.send(f"Unsubscribed from {target}.")
+        else:
+            await ctx.author.send(f"You are not subscribed to {target}.")
+
+    @commands.command()
+    async def pm_streams(self, ctx):
+        """List your `Subreddit` stream subscriptions.
+
+        Results:
+            message (class Message): Subscribed subreddits and their watch phrases.
+        """
+        subs = self.streams.subscriptions(ctx.author.id)
+        if not subs:
+            await ctx.author.send("You have no stream subscriptions.")
+            return
+        lines = [
+            f"r/{sub} - " + (", ".join(f'"{x}"' for x in phrases) or "all posts")
+            for sub, phrases in subs.items()
+        ]
+        await ctx.author.send("**Stream subscriptions:**\n" + "\n".join(lines))
 
     @commands.command()
     async def hot_posts(self, ctx, sub: str, count: int = 5):
@@ -110,14 +167,10 @@ class RedditCog(commands.Cog):
             sub (str): The subreddit name as a string, without the 'r/'
             count (str): Default `5` posts.
         Returns:
-            message (class Embed): A series of embedded messages with `Submission` content.
+            message (class Embed): A paginated embedded message with `Submission` content.
         """
-        subreddit = self.reddit.subreddit(sub)
-        content = subreddit.hot(limit=count)
-        posts = RedditCog._structure_posts(content)
-
-        for x in posts:
-            await ctx.send(f"{x}")
+        posts = await self.listings.posts(sub, "hot", count)
+        await paginate(ctx, EmbedPageSource(posts))
 
     @commands.command()
     async def pm_hot_posts(self, ctx, sub: str, count: int = 5):
@@ -130,17 +183,15 @@ class RedditCog(commands.Cog):
             sub (str): The subreddit name as a string, without the 'r/'
             count (str): Default `5` posts.
         Returns:
-            message (class Embed): A series of embedded messages with `Submission` content.
+            message (class Embed): A paginated embedded message with `Submission` content.
         """
-        subreddit = self.reddit.subreddit(sub)
-        content = subreddit.hot(limit=count)
-        posts = RedditCog._structure_posts(content)
-
-        for x in posts:
-            await ctx.author.send(f"{x}")
+        posts = await self.listings.posts(sub, "hot", count)
+        await paginate(ctx, EmbedPageSource(posts), dm=True)
 
     @commands.command()
-    async def top_posts(self, ctx, sub: str, timeframe: str = "hour"):
+    async def top_posts(
+        self, ctx, sub: str, timeframe: str = "hour", count: int = 100
+    ):
         """Top posts from a subreddit.
 
         Gets top post from a sub of your choice. Must provide `timeframe`
@@ -149,20 +200,19 @@ class RedditCog(commands.Cog):
         Parameters:
             sub (str): The subreddit name as a string, without the 'r/'
             timeframe (str): Default `hour`, other acceptable options are below.
+            count (int): Default `100` posts.
         Options:
             timeframe (str): Available options: "hour", "day", "week", "month", "year", "all".
         Returns:
-            message (class Embed): A series of embedded messages with `Submission` content.
+            message (class Embed): A paginated embedded message with `Submission` content.
         """
-        subreddit = self.reddit.subreddit(sub)
-        content = subreddit.top(timeframe)
-        posts = RedditCog._structure_posts(content)
-
-        for x in posts:
-            await ctx.send(embed=x)
+        posts = await self.listings.posts(sub, "top", count, timeframe)
+        await paginate(ctx, EmbedPageSource(posts))
 
     @commands.command()
-    async def pm_top_posts(self, ctx, sub: str, timeframe: str = "hour"):
+    async def pm_top_posts(
+        self, ctx, sub: str, timeframe: str = "hour", count: int = 100
+    ):
         """PM top posts from a subreddit.
 
         Gets top post from a sub of your choice and sends them in a DM.
@@ -171,66 +221,180 @@ class RedditCog(commands.Cog):
         Parameters:
             sub (str): The subreddit name as a string, without the 'r/'
             timeframe (str): Default `hour`, other acceptable options are below.
+            count (int): Default `100` posts.
         Options:
             timeframe (str): Available options: "hour", "day", "week", "month", "year", "all".
         Returns:
-            message (class Embed): A series of embedded messages with `Submission` content.
+            message (class Embed): A paginated embedded message with `Submission` content.
         """
-        subreddit = self.reddit.subreddit(sub)
-        content = subreddit.top(timeframe)
-        posts = RedditCog._structure_posts(content)
-
-        for x in posts:
-            await ctx.author.send(embed=x)
+        posts = await self.listings.posts(sub, "top", count, timeframe)
+        await paginate(ctx, EmbedPageSource(posts), dm=True)
 
     @commands.command()
-    async def pm_comments(self, ctx, post_id: str, sort: str = "top"):
-        """PM a list of comments from a `Submission`.
+    async def pm_comments(
+        self,
+        ctx,
+        post_id: str,
+        sort: str = "top",
+        depth: int = 3,
+        breadth: int = 10,
+    ):
+        """PM a page of comments from a `Submission`.
 
         Send a Discord message of comments from a `Submission` object.
         Takes parameters for different sort options for comments.
-        Parses the `CommentForest` return from `Submission`.
+        Walks the `CommentForest` lazily, a page at a time, use
+        `!pm_next_comments` to continue where the last page stopped.
 
         Parameters:
             post_id (str): The `post_id` from a Reddit post.
             sort (str): Default `top`, has other options.
+            depth (int): Default `3`, reply levels to descend.
+            breadth (int): Default `10`, replies visited per comment.
         Options:
             sort (str): Available options: "confidence", "controversial", "new", "old", "q&a", "top".
         Returns:
-            message (class Embed): A series of embedded messages with `Comment` content.
+            message (class Embed): A paginated embedded message with `Comment` content.
         """
-        submission = self.reddit.submission(post_id)
-        submission.comment_sort = sort
-        content = submission.comments.list()
-        comments = RedditCog._structure_comments(content)
 
-        for x in comments:
-            await ctx.author.send(embed=x)
+        def walk(reddit):
+            submission = reddit.submission(post_id)
+            submission.comment_sort = sort
+            submission.comment_limit = settings.REDDIT_COMMENT_FETCH_LIMIT
+            walker = CommentWalker(
+                submission.comments,
+                max_depth=depth,
+                max_breadth=breadth,
+                more_budget=settings.REDDIT_COMMENT_MORE_BUDGET,
+            )
+            return reddit, submission, walker
+
+        cursor = await self.client.run(walk)
+        await self._send_comment_page(ctx, cursor)
 
     @commands.command()
-    async def pm_more_comments(self, ctx, comment_id: str, sort: str = "top"):
-        """PM a list of comments from a `Comment`.
+    async def pm_more_comments(
+        self,
+        ctx,
+        comment_id: str,
+        sort: str = "top",
+        depth: int = 3,
+        breadth: int = 10,
+    ):
+        """PM a page of replies to a `Comment`.
 
         Send a Discord message of comments from a `Comment` object.
         Takes parameters for different sort options for comments.
-        Parses the `CommentForest` return from `Comment`.
+        Walks the reply `CommentForest` lazily, a page at a time, use
+        `!pm_next_comments` to continue where the last page stopped.
 
         Parameters:
             comment_id (str): The `comment_id` from a Reddit comment.
             sort (str): Default `top`, has other options.
+            depth (int): Default `3`, reply levels to descend.
+            breadth (int): Default `10`, replies visited per comment.
         Options:
             sort (str): Available options: "confidence", "controversial", "new", "old", "q&a", "top".
         Returns:
-            message (class Embed): A series of embedded messages with `Comment` content.
+            message (class Embed): A paginated embedded message with `Comment` content.
         """
-        comment = self.reddit.comment(comment_id)
-        comment.refresh()
-        comment.reply_sort = sort
-        content = comment.replies
-        comments = RedditCog._structure_comments(content)
 
-        for x in comments:
-            await ctx.author.send(embed=x)
+        def walk(reddit):
+            comment = reddit.comment(comment_id)
+            comment.reply_sort = sort
+            comment.reply_limit = settings.REDDIT_COMMENT_FETCH_LIMIT
+            comment.refresh()
+            walker = CommentWalker(
+                comment.replies,
+                max_depth=depth,
+                max_breadth=breadth,
+                more_budget=settings.REDDIT_COMMENT_MORE_BUDGET,
+            )
+            return reddit, comment.submission, walker
+
+        cursor = await self.client.run(walk)
+        await self._send_comment_page(ctx, cursor)
+
+    @commands.command()
+    async def pm_next_comments(self, ctx):
+        """PM the next page of your last `pm_comments` or `pm_more_comments`.
+
+        Returns:
+            message (class Embed): A paginated embedded message with `Comment` content.
+        """
+        cursor = self.comment_cursors.get(ctx.author.id)
+        if cursor is None:
+            await ctx.author.send(
+                "No comments to continue, start with `!pm_comments <post_id>`."
+            )
+            return
+        await self._send_comment_page(ctx, cursor)
+
+    async def _send_comment_page(self, ctx, cursor: tuple):
+        """Walk and DM the next page of a comment cursor.
+
+        The page is walked on the `praw.Reddit` that created the cursor, and the
+        cursor is kept for `pm_next_comments` until the walk is exhausted.
+
+        Parameters:
+            cursor (tuple): `(reddit, submission, walker)` from a comment command.
+        """
+        reddit, submission, walker = cursor
+
+        def page(_):
+            comments = [x for x, _ in walker.page(settings.REDDIT_COMMENT_PAGE_SIZE)]
+            return RedditCog._hydrate_comments(comments, submission)
+
+        comments = await self.client.run_on(reddit, page)
+
+        if walker.exhausted:
+            self.comment_cursors.invalidate(ctx.author.id)
+            header = "No more comments after these."
+        else:
+            self.comment_cursors.set(ctx.author.id, cursor)
+            header = "Use `!pm_next_comments` for the next comments."
+        if not comments:
+            await ctx.author.send("No more comments.")
+            return
+        source = EmbedPageSource(
+            comments,
+            render=lambda x: RedditCog._structure_comments([x])[0],
+            header=header,
+        )
+        await paginate(ctx, source, dm=True)
+
+    @commands.command(hidden=True)
+    async def reddit_cache(self, ctx):
+        """Reddit listing cache statistics.
+
+        Returns:
+            message (class Message): Cache size, hits, misses, evictions
+                                    and coalesced requests.
+        """
+        stats = {
+            **self.listings.cache.stats(),
+            "coalesced": self.listings.flights.coalesced,
+        }
+        stats = "\n".join(f"{k}: {v}" for k, v in stats.items())
+        await ctx.send(f"**Reddit listing cache:**\n```{stats}```")
+
+    @commands.command(hidden=True)
+    async def reddit_requests(self, ctx):
+        """Reddit HTTP requests per command.
+
+        Returns:
+            message (class Message): Total requests, invocations and requests per
+                                    invocation for each command.
+        """
+        stats = self.client.request_stats()
+        lines = [
+            f"{label}: {count} requests / {calls} calls"
+            + (f" ({count / calls:.1f} per call)" if calls else "")
+            for label, (count, calls) in sorted(stats.items())
+        ]
+        await ctx.send(
+            "**Reddit requests:**\n```" + ("\n".join(lines) or "none yet") + "```"
+        )
 
     @staticmethod
     def _structure_posts(content: list):
@@ -284,35 +448,65 @@ class RedditCog(commands.Cog):
         return embeds
 
     @staticmethod
-    def _structure_comments(content: list):
-        """Structure `Submission` comments.
+    def _hydrate_comments(content: list, submission=None):
+        """Resolve comment data for a batch without per-comment lazy fetches.
 
-        Create `Embed` objects as Discord messages for each post comment.
-        Structured from a dictionary of content data from each message.
+        Parent submission titles are resolved once per submission and memoized
+        for the whole batch, and reply counts come from the already loaded
+        comment tree (`MoreComments` placeholders contribute their `count`)
+        instead of refetching each comment. `MoreComments` entries in `content`
+        are skipped.
 
         Parameters:
             content (class CommentForest): A list of `Comment` subreddit objects.
+            submission (class Submission): Default `None`, the already loaded parent
+                                        submission of the comments, if known.
 
         Returns:
-            embeds (class Embed): A formatted list of `Embed` messages to be sent to Discord.
+            comments (list): A dictionary of content data for each comment.
         """
+        titles = {}
+        if submission is not None:
+            titles[submission.fullname] = submission.title
         comments = []
         for x in content:
+            if isinstance(x, MoreComments):
+                continue
+            if x.link_id not in titles:
+                titles[x.link_id] = x.submission.title
             comments.append(
                 {
-                    "submission_name": x.submission.title,
+                    "submission_name": titles[x.link_id],
                     "subreddit": x.subreddit.display_name,
                     "body": x.body,
                     "score": str(x.score),
-                    "num_comments": len(x.replies),
+                    "num_comments": sum(
+                        y.count if isinstance(y, MoreComments) else 1
+                        for y in x.replies
+                    ),
                     "comment_id": x.id,
-                    "comment_author": x.author.name,
+                    "comment_author": x.author.name if x.author else "[deleted]",
                     "url": x.permalink,
                     "created_at": datetime.utcfromtimestamp(x.created_utc).strftime(
                         "%m-%d-%Y %H:%M:%S"
                     ),
                 }
             )
+        return comments
+
+    @staticmethod
+    def _structure_comments(comments: list):
+        """Structure `Submission` comments.
+
+        Create `Embed` objects as Discord messages for each post comment.
+        Structured from a dictionary of content data from each message.
+
+        Parameters:
+            comments (list): Comment data from `_hydrate_comments`.
+
+        Returns:
+            embeds (class Embed): A formatted list of `Embed` messages to be sent to Discord.
+        """
         embeds = []
         for x in comments:
             embed = discord.Embed(title=x["submission_name"], color=0xFF5700)
@@ -331,3 +525,8 @@ class RedditCog(commands.Cog):
             )
             embeds.append(embed)
         return embeds
+
+
+def setup(bot):
+    """Extension entry point, called by `bot.load_extension`."""
+    bot.add_cog(RedditCog(bot))
@@ -1,16 +1,29 @@
+import asyncio
+import io
 import json
+import time
 from datetime import datetime, timedelta
 
 import discord
-import tweepy
 from discord.ext import commands
-from tabulate import tabulate
 
 import settings
+from cogs.utils.archive import TimelineArchive
+from cogs.utils.expiry import TweetExpiry
 from cogs.utils.helpers import Helpers
-
-
-class TwitterCog(commands.Cog):
+from cogs.utils.lifecycle import ReadyCog
+from cogs.utils.pages import (
+    EmbedPageSource,
+    LazyEmbedPageSource,
+    TextPageSource,
+    paginate,
+)
+from cogs.utils.ratelimit import RateLimitRegistry
+from cogs.utils.streams import TimelineFeedManager
+from cogs.utils.twitter import STATUSES_PER_CALL, TimelineCache, TwitterClient
+
+
+class TwitterCog(ReadyCog):
     """Twitter functionality.
 
     This cog is used to provide Twitter functionality through Tweepy. The basic implementation
@@ -20,87 +33,152 @@ class TwitterCog(commands.Cog):
 
     """
 
-    auth = tweepy.OAuthHandler(
-        settings.TWITTER_API_KEY, settings.TWITTER_API_SECRET_KEY
-    )
-    auth.set_access_token(
-        settings.TWITTER_ACCESS_TOKEN, settings.TWITTER_ACCESS_TOKEN_SECRET
-    )
-
     def __init__(self, bot):
         """Twitter Authentication and bot extension.
 
         Inherits the bot instance and provides API extension with Tweepy.
-        Offers access to authenticated screenname and extendable `self.api`.
+        Offers access to authenticated screenname and the rate-aware `self.twitter`.
+        No requests are made here, the screen name is looked up in `async_setup`.
 
         Attributes:
             bot: BrandoBot (class `BrandoBot`)
                 Instance of the BrandoBot client.
-            api: tweepy.API (class `API`)
-                Instance of Tweepy API.
+            twitter: TwitterClient (class `TwitterClient`)
+                Runs Tweepy calls off the event loop within each endpoint's budget.
+                Public user timelines are read with the app-only bearer tokens.
             screen_name: `api.me().screen_name`
-                Authenticated user screen name
+                Authenticated user screen name, `None` until set up.
+            timelines: TimelineCache (class `TimelineCache`)
+                Recent list and user timelines, refreshed with `since_id`.
+            archive: TimelineArchive (class `TimelineArchive`)
+                Local index of the account's tweets used to plan `expire_tweets`,
+                `None` when `TWITTER_ARCHIVE_PATH` is empty.
+            feeds: TimelineFeedManager (class `TimelineFeedManager`)
+                One shared background feed per list or user streamed to channels.
         """
         self.bot = bot
-        self.api = tweepy.API(TwitterCog.auth)
-        self.screen_name = self.api.me().screen_name
+        self.rate_limits = RateLimitRegistry.for_bot(bot)
+        self.twitter = TwitterClient.from_settings(
+            budgets=self.rate_limits.provider("twitter"),
+            app_budgets=[
+                self.rate_limits.provider(f"twitter (app {i + 1})")
+                for i in range(len(settings.TWITTER_BEARER_TOKENS))
+            ],
+        )
+        self.screen_name = None
+        self.timelines = TimelineCache(
+            self.twitter,
+            TwitterCog._format_tweets,
+            ttl=settings.TWITTER_TIMELINE_CACHE_TTL,
+            retain=settings.TWITTER_TIMELINE_CACHE_RETAIN,
+            maxsize=settings.TWITTER_TIMELINE_CACHE_SIZE,
+        )
+        self.archive = None
+        if settings.TWITTER_ARCHIVE_PATH:
+            self.archive = TimelineArchive(settings.TWITTER_ARCHIVE_PATH)
+        self.feeds = TimelineFeedManager(
+            bot,
+            self.twitter,
+            TwitterCog._format_tweets,
+            min_interval=settings.TWITTER_FEED_MIN_INTERVAL,
+            max_interval=settings.TWITTER_FEED_MAX_INTERVAL,
+        )
+        self._expiry = None
+
+    async def async_setup(self):
+        """Look up the authenticated user's screen name."""
+        me = await self.twitter.run("account/verify_credentials", lambda api: api.me())
+        self.screen_name = me.screen_name
+
+    def cog_unload(self):
+        """Stop feeds, the Twitter worker pool and archive when the cog is removed."""
+        super().cog_unload()
+        self.feeds.close()
+        self.twitter.close()
+        if self.archive is not None:
+            self.archive.close()
 
     @commands.command()
-    async def rate_limit_tweets(self, ctx):
-        """Twitter API rate limit.
+    async def rate_limit_tweets(self, ctx, attach: bool = False):
+        """Twitter, Reddit and OpenWeatherMap API rate limits.
+
+        Return the rate limits recorded from recent API responses, without
+        spending any requests. Endpoints that have not been called yet are
+        not listed.
 
-        Return status of the Twitter API rate limit as a .txt file.
+        Parameters:
+            attach (bool): Default `False`, send a JSON dump as `rate_limit.txt`.
 
         Returns:
-            logs/: Directory for log files.
-            rate_limit.txt: JSON dump of current API rate limit.
-            message (class Message): Message including `rate_limit.txt` file.
+            message (class Message): A summary of remaining requests per endpoint,
+                                    or a message including `rate_limit.txt`.
         """
-        status = self.api.rate_limit_status()
-        file_path = "logs/rate_limit.txt"
-        with open(file_path, "w") as f:
-            f.write(json.dumps(status))
-            f.close()
-        file = discord.File(file_path, filename="rate_limit.txt")
-        await ctx.send(file=file, content="Current rate limit status")
+        if attach:
+            data = json.dumps(self.rate_limits.snapshot(), indent=2).encode()
+            file = discord.File(io.BytesIO(data), filename="rate_limit.txt")
+            await ctx.send(file=file, content="Current rate limit status")
+            return
+        lines = ["**Current rate limit status**", "```"]
+        lines.extend(self.rate_limits.summary())
+        lines.append("```")
+        await asyncio.gather(
+            *(
+                self.bot.outbox.enqueue(ctx.channel, x)
+                for x in Helpers.break_message(lines, wrap_at=None)
+            )
+        )
 
     @commands.command()
     async def expire_tweets(self, ctx, days: int, test: bool):
         """Delete tweets that are older than X days.
 
         Deletes tweets older than a specified timeframe, can be run in test mode
-        by using the `True` parameter in `test`.
+        by using the `True` parameter in `test`. Old tweets are found with a
+        query on the local timeline archive, which is first synced with any
+        tweets posted since the last run. Deletions run concurrently and are
+        recorded as they go, so rerunning after a failure resumes where the
+        last run stopped. Progress is shown in one message that is edited as
+        the run goes.
 
         Parameters:
             days (int): Number of days to save.
             test (bool): `True` = testing, no delete. `False` = not testing, delete.
 
         Returns:
-            message (class Message): Total tweets deleted and ignored.
+            message (class Message): Tweets scanned, deleted (or eligible) and failed.
         """
-        deletion_count = 0
-        ignored_count = 0
-
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-
-        timeline = tweepy.Cursor(self.api.user_timeline).items()
-        await ctx.send("**Total tweets:** {timeline}".format(timeline=range(timeline)))
-        for tweet in timeline:
-            if tweet.created_at < cutoff_date:
-                if not test:
-                    self.api.destroy_status(tweet.id)
-                else:
-                    ignored_count += 1
-                deletion_count += 1
-            else:
-                ignored_count += 1
-        await ctx.send(
-            "**Total tweets remaining:** {timeline}\n Deleted {deletion_count} tweet(s), ignored {ignored_count} tweet(s)".format(
-                timeline=range(timeline),
-                deletion_count=deletion_count,
-                ignored_count=ignored_count,
-            )
+        if self._expiry is not None:
+            await ctx.send("Tweets are already being expired, try again later.")
+            return
+        job = TweetExpiry(
+            self.twitter,
+            days,
+            archive=self.archive,
+            checkpoint=settings.TWITTER_EXPIRE_CHECKPOINT,
+            concurrency=settings.TWITTER_EXPIRE_CONCURRENCY,
+            dry_run=test,
         )
+        self._expiry = job
+        message = await ctx.send(job.status())
+        last_edit = time.monotonic()
+        interval = settings.TWITTER_EXPIRE_PROGRESS_INTERVAL
+
+        async def progress(job):
+            nonlocal last_edit
+            if time.monotonic() - last_edit >= interval:
+                last_edit = time.monotonic()
+                await message.edit(content=job.status())
+
+        try:
+            await job.run(on_progress=progress)
+        except Exception:
+            await message.edit(
+                content=f"{job.status()}\nStopped early, rerun to resume."
+            )
+            raise
+        finally:
+            self._expiry = None
+        await message.edit(content=job.status())
 
     @commands.command()
     async def create_list(self, ctx, list_name: str, description: str = None):
@@ -119,8 +197,11 @@ class TwitterCog(commands.Cog):
         TODO:
             * Resolve incorrect `created_at` from 1970 to current year.
         """
-        new_list = self.api.create_list(
-            name=list_name, mode="private", description=description
+        new_list = await self.twitter.run(
+            "lists/create",
+            lambda api: api.create_list(
+                name=list_name, mode="private", description=description
+            ),
         )
         await ctx.send(
             f"**Created list object:** \n"
@@ -142,7 +223,12 @@ class TwitterCog(commands.Cog):
         Returns:
             message (class Message): Delete message confirmation.
         """
-        self.api.destroy_list(slug=list_name, owner_screen_name=self.screen_name)
+        await self.twitter.run(
+            "lists/destroy",
+            lambda api: api.destroy_list(
+                slug=list_name, owner_screen_name=self.screen_name
+            ),
+        )
         await ctx.send(f"Deleted list object: \n" f"name - {list_name}")
 
     @commands.command()
@@ -154,7 +240,11 @@ class TwitterCog(commands.Cog):
         Returns:
             message (class Message): Messages with list names, member counts, and descriptions.
         """
-        lists = self.api.lists_all(screen_name=self.screen_name)
+        from tabulate import tabulate
+
+        lists = await self.twitter.run(
+            "lists/list", lambda api: api.lists_all(screen_name=self.screen_name)
+        )
         formatted_lists = []
         for x in lists:
             formatted_lists.append(
@@ -165,19 +255,21 @@ class TwitterCog(commands.Cog):
                 }
             )
         formatted_lists = Helpers.break_message(
-            tabulate(formatted_lists, headers="keys", tablefmt="presto")
+            tabulate(formatted_lists, headers="keys", tablefmt="presto"),
+            wrap_at=None,
+            limit=1900,
+        )
+        await paginate(
+            ctx,
+            TextPageSource(list(formatted_lists), header="**Available lists:** \n"),
         )
-        await ctx.send("**Available lists:** \n")
-        for x in formatted_lists:
-            await ctx.send(f"{x}")
 
     @commands.command()
     async def add_list_members(self, ctx, list_name: str, *members):
         """Add Twitter users to an existing private list.
 
         Does not require the `@`.
-        Adds a list of members to a list.
-        Add up to 100 members to a list at a time.
+        Adds a list of members to a list, 100 members per request.
         Lists may have up to 5,000 members.
 
         Parameters:
@@ -185,29 +277,16 @@ class TwitterCog(commands.Cog):
             members (*): Unquoted list of usernames without `@`.
 
         Returns:
-            message (class Message): List of members added.
+            message (class Message): Whether each member was added.
         """
-        added_members_list = []
-        for x in members:
-            self.api.add_list_member(
-                slug=list_name, owner_screen_name=self.screen_name, screen_name=x
-            )
-            added_members_list.append(x)
-        await ctx.send(
-            f"**Added members to list:** \n"
-            f"name - {list_name}\n"
-            f"members added - \n"
-        )
-        messages = Helpers.break_message(added_members_list)
-        for x in messages:
-            await ctx.send(f"{x}")
+        await self._change_list_members(ctx, list_name, members, add=True)
 
     @commands.command()
     async def remove_list_members(self, ctx, list_name: str, *members):
         """Remove Twitter users from an existing private list.
 
         Does not require the `@`.
-        Remove up to 100 members from a list at a time.
+        Removes a list of members from a list, 100 members per request.
         Lists may have up to 5,000 members.
 
         Parameters:
@@ -215,22 +294,36 @@ class TwitterCog(commands.Cog):
             members (*): Unquoted list of usernames without `@`.
 
         Returns:
-            message (class Message): List of members removed.
+            message (class Message): Whether each member was removed.
         """
-        removed_members_list = []
-        for x in members:
-            self.api.remove_list_member(
-                slug=list_name, owner_screen_name=self.screen_name, screen_name=x
-            )
-            removed_members_list.append(x)
-        await ctx.send(
-            f"**Removed members from list:** \n"
-            f"name - {list_name}\n"
-            f"members removed - \n"
+        await self._change_list_members(ctx, list_name, members, add=False)
+
+    async def _change_list_members(self, ctx, list_name: str, members, add: bool):
+        """Apply a bulk membership change and report the result of each user."""
+        results = await self.twitter.change_list_members(
+            list_name,
+            self.screen_name,
+            members,
+            add=add,
+            concurrency=settings.TWITTER_LIST_CONCURRENCY,
+        )
+        done = "added" if add else "removed"
+        header = (
+            "**Added members to list:**" if add else "**Removed members from list:**"
         )
-        messages = Helpers.break_message(removed_members_list)
-        for x in messages:
-            await ctx.send(f"{x}")
+        count = sum(1 for x in results.values() if x == done)
+        sent = [
+            self.bot.outbox.enqueue(
+                ctx.channel,
+                f"{header} \n"
+                f"name - {list_name}\n"
+                f"members {done} - {count}/{len(results)}\n",
+            )
+        ]
+        lines = (f"{name} - {result}" for name, result in results.items())
+        for x in Helpers.break_message(lines, wrap_at=None):
+            sent.append(self.bot.outbox.enqueue(ctx.channel, x))
+        await asyncio.gather(*sent)
 
     @commands.command()
     async def pm_list(
@@ -247,19 +340,13 @@ class TwitterCog(commands.Cog):
             include_rts (bool): Default `True` to include retweets.
 
         Returns:
-            message (class Message): Messages of tweets formatted as a table.
+            message (class Message): A paginated message of tweets.
         """
-        timeline = self.api.list_timeline(
-            slug=list_name,
-            owner_screen_name=self.screen_name,
-            include_entities=True,
-            count=count,
-            include_rts=include_rts,
+        tweets = await self._list_tweets(list_name, count, include_rts)
+        source = EmbedPageSource(
+            tweets, header=f"**List of tweets from:** {list_name}"
         )
-        tweets = TwitterCog._format_tweets(timeline)
-        await ctx.author.send(f"**List of tweets from:** {list_name}\n")
-        for x in tweets:
-            await ctx.author.send(embed=x)
+        await paginate(ctx, source, dm=True)
 
     @commands.command()
     async def display_list(
@@ -276,61 +363,235 @@ class TwitterCog(commands.Cog):
             include_rts (bool): Default `True` to include retweets.
 
         Returns:
-            message (class Message): Messages of tweets formatted as a table.
+            message (class Message): A paginated message of tweets.
         """
-        timeline = self.api.list_timeline(
-            slug=list_name,
-            owner_screen_name=self.screen_name,
-            include_entities=True,
-            count=count,
-            include_rts=include_rts,
+        tweets = await self._list_tweets(list_name, count, include_rts)
+        source = EmbedPageSource(
+            tweets, header=f"**List of tweets from:** {list_name}"
         )
-        tweets = TwitterCog._format_tweets(timeline)
-        await ctx.send(f"**List of tweets from:** {list_name}\n")
-        for x in tweets:
-            await ctx.send(embed=x)
+        await paginate(ctx, source)
 
     @commands.command()
-    async def pm_user(self, ctx, screen_name: str, count: int = 20):
+    async def pm_user(self, ctx, screen_name: str, count: int = 20, days: int = None):
         """PM user timeline (default 20 tweets) to user.
 
         Will send a list of messages with a specified count to the user via Discord PM.
-        These are formatted as a table.
+        These are formatted as a table. Counts over 200 or a `days` cutoff are
+        paged from Twitter as the messages are read.
 
         Parameters:
-            list_name (str): Slug fro the `List` object.
+            screen_name (str): The user's screen name.
             Count (int): Default 20, specified count of tweets to return.
-            include_rts (bool): Default `True` to include retweets.
+            days (int): Default `None`, only return tweets from the last X days.
 
         Returns:
-            message (class Message): Messages of tweets formatted as a table.
+            message (class Message): A paginated message of tweets.
         """
-        timeline = self.api.user_timeline(screen_name=screen_name, count=count)
-        tweets = TwitterCog._format_tweets(timeline)
-        await ctx.author.send(f"**List of tweets from:** {screen_name}\n")
-        for x in tweets:
-            await ctx.author.send(embed=x)
+        source = await self._user_source(screen_name, count, days)
+        await paginate(ctx, source, dm=True)
 
     @commands.command()
-    async def display_user(self, ctx, screen_name: str, count: int = 20):
+    async def display_user(
+        self, ctx, screen_name: str, count: int = 20, days: int = None
+    ):
         """Display user timeline (default 20 tweets) in message channel.
 
         Will send a list of messages with a specified count to the channel.
-        These are formatted as a table.
+        These are formatted as a table. Counts over 200 or a `days` cutoff are
+        paged from Twitter as the messages are read.
 
         Parameters:
-            list_name (str): Slug fro the `List` object.
+            screen_name (str): The user's screen name.
             Count (int): Default 20, specified count of tweets to return.
+            days (int): Default `None`, only return tweets from the last X days.
+
+        Returns:
+            message (class Message): A paginated message of tweets.
+        """
+        source = await self._user_source(screen_name, count, days)
+        await paginate(ctx, source)
+
+    async def _list_tweets(self, list_name: str, count: int, include_rts: bool):
+        """Newest `count` tweets of a list as `Embed` objects, via the cache."""
+        return await self.timelines.embeds(
+            ("list", list_name.lower(), include_rts),
+            "lists/statuses",
+            lambda api, **kwargs: api.list_timeline(
+                slug=list_name,
+                owner_screen_name=self.screen_name,
+                include_entities=True,
+                include_rts=include_rts,
+                **kwargs,
+            ),
+            count,
+        )
+
+    async def _user_tweets(self, screen_name: str, count: int):
+        """Newest `count` tweets of a user as `Embed` objects, via the cache."""
+        return await self.timelines.embeds(
+            ("user", screen_name.lower()),
+            "statuses/user_timeline",
+            lambda api, **kwargs: api.user_timeline(screen_name=screen_name, **kwargs),
+            count,
+            app_only=True,
+        )
+
+    async def _user_source(self, screen_name: str, count: int, days: int):
+        """Page source of a user's newest tweets.
+
+        Counts the timeline cache can hold are served from it. Deeper requests
+        and date cutoffs stream from `TwitterClient.paged_timeline` instead.
+        """
+        header = f"**List of tweets from:** {screen_name}"
+        if days is None and count <= STATUSES_PER_CALL:
+            tweets = await self._user_tweets(screen_name, count)
+            return EmbedPageSource(tweets, header=header)
+        until = None
+        if days is not None:
+            until = datetime.utcnow() - timedelta(days=days)
+        tweets = self.twitter.paged_timeline(
+            "statuses/user_timeline",
+            lambda api, **kwargs: api.user_timeline(screen_name=screen_name, **kwargs),
+            TwitterCog._format_tweets,
+            count,
+            until=until,
+            app_only=True,
+        )
+        return LazyEmbedPageSource(tweets, header=header)
+
+    @commands.command()
+    async def stream_list(self, ctx, list_name: str, include_rts: bool = True):
+        """Post new tweets from a list in this channel.
+
+        Sends each new tweet on the list to the channel until it is stopped with
+        `!unstream_list <list_name>`. One feed is shared by every channel
+        following the list, and polls more often while the list is busy.
+
+        Parameters:
+            list_name (str): Slug for the `List` object.
             include_rts (bool): Default `True` to include retweets.
 
         Returns:
-            message (class Message): Messages of tweets formatted as a table.
+            message (class Message): Subscription confirmation.
         """
-        timeline = self.api.user_timeline(screen_name=screen_name, count=count)
-        tweets = TwitterCog._format_tweets(timeline)
-        await ctx.send(f"**List of tweets from:** {screen_name}\n")
-        for x in tweets:
-            await ctx.send(embed=x)
+
+        def timeline(api, **kwargs):
+            return api.list_timeline(
+                slug=list_name,
+                owner_screen_name=self.screen_name,
+                include_entities=True,
+                include_rts=include_rts,
+                **kwargs,
+            )
+
+        # Feeds with and without retweets are separate, a channel follows one.
+        key = ("list", list_name.lower(), include_rts)
+        self.feeds.unsubscribe(
+            ("list", list_name.lower(), not include_rts), ctx.channel.id
+        )
+        if self.feeds.subscribe(key, "lists/statuses", timeline, ctx.channel.id):
+            await ctx.send(
+                f"Streaming new tweets from {list_name} here. "
+                f"Use `!unstream_list {list_name}` to stop."
+            )
+        else:
+            await ctx.send(f"This channel already streams {list_name}.")
+
+    @commands.command()
+    async def unstream_list(self, ctx, list_name: str):
+        """Stop posting new tweets from a list in this channel.
+
+        Parameters:
+            list_name (str): Slug for the `List` object.
+
+        Returns:
+            message (class Message): Unsubscribe confirmation.
+        """
+        removed = [
+            self.feeds.unsubscribe(("list", list_name.lower(), x), ctx.channel.id)
+            for x in (True, False)
+        ]
+        if any(removed):
+            await ctx.send(f"Stopped streaming {list_name}.")
+        else:
+            await ctx.send(f"This channel does not stream {list_name}.")
+
+    @commands.command()
+    async def stream_user(self, ctx, screen_name: str):
+        """Post new tweets from a user in this channel.
+
+        Sends each new tweet by the user to the channel until it is stopped with
+        `!unstream_user <screen_name>`. One feed is shared by every channel
+        following the user.
+
+        Parameters:
+            screen_name (str): The user's screen name.
+
+        Returns:
+            message (class Message): Subscription confirmation.
+        """
+        screen_name = screen_name.lstrip("@")
+
+        def timeline(api, **kwargs):
+            return api.user_timeline(screen_name=screen_name, **kwargs)
+
+        key = ("user", screen_name.lower())
+        if self.feeds.subscribe(
+            key, "statuses/user_timeline", timeline, ctx.channel.id, app_only=True
+        ):
+            await ctx.send(
+                f"Streaming new tweets from @{screen_name} here. "
+                f"Use `!unstream_user {screen_name}` to stop."
+            )
+        else:
+            await ctx.send(f"This channel already streams @{screen_name}.")
+
+    @commands.command()
+    async def unstream_user(self, ctx, screen_name: str):
+        """Stop posting new tweets from a user in this channel.
+
+        Parameters:
+            screen_name (str): The user's screen name.
+
+        Returns:
+            message (class Message): Unsubscribe confirmation.
+        """
+        screen_name = screen_name.lstrip("@")
+        if self.feeds.unsubscribe(("user", screen_name.lower()), ctx.channel.id):
+            await ctx.send(f"Stopped streaming @{screen_name}.")
+        else:
+            await ctx.send(f"This channel does not stream @{screen_name}.")
+
+    @commands.command()
+    async def twitter_streams(self, ctx):
+        """List the lists and users streamed to this channel.
+
+        Returns:
+            message (class Message): Streamed timelines and their poll intervals.
+        """
+        feeds = self.feeds.subscriptions(ctx.channel.id)
+        if not feeds:
+            await ctx.send("This channel has no Twitter streams.")
+            return
+        lines = []
+        for (kind, name, *options), interval in feeds.items():
+            if kind == "user":
+                label = f"@{name}"
+            else:
+                label = f"list {name}" + ("" if options[0] else " (no retweets)")
+            lines.append(f"{label} - every {interval:.0f}s")
+        await ctx.send("**Twitter streams:**\n" + "\n".join(lines))
+
+    @commands.command(hidden=True)
+    async def twitter_cache(self, ctx):
+        """Twitter timeline cache statistics.
+
+        Returns:
+            message (class Message): Cache size, hits, misses, delta and full
+                                    refreshes, and coalesced requests.
+        """
+        stats = "\n".join(f"{k}: {v}" for k, v in self.timelines.stats().items())
+        await ctx.send(f"**Twitter timeline cache:**\n```{stats}```")
 
     @staticmethod
     def _format_tweets(timeline: list):
@@ -381,3 +642,8 @@ class TwitterCog(commands.Cog):
             embed.set_footer(text=f'{x["created_at"]}')
             embeds.append(embed)
         return embeds
+
+
+def setup(bot):
+    """Extension entry point, called by `bot.load_extension`."""
+    bot.add_cog(TwitterCog(bot))
@@ -0,0 +1,164 @@
+import calendar
+import os
+import sqlite3
+from datetime import datetime
+
+from cogs.utils.executor import BlockingExecutor
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tweets (
+    id INTEGER PRIMARY KEY,
+    created_at INTEGER NOT NULL,
+    deleted INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS tweets_live_by_date ON tweets (deleted, created_at);
+"""
+
+
+def _epoch(date: datetime):
+    """Seconds since the epoch of a naive UTC datetime."""
+    return calendar.timegm(date.utctimetuple())
+
+
+class TimelineArchive:
+    """Local SQLite index of the authenticated account's tweets.
+
+    Only tweet IDs and creation times are kept. `sync` fetches tweets newer
+    than the newest archived one with `since_id`, so after the first sync it
+    costs a single request when nothing was posted. Tweets are marked deleted
+    rather than removed, which keeps the newest ID (the sync cursor) intact.
+    Expiry planning is an indexed range query over live tweets.
+
+    Every query runs on a single dedicated worker thread, which also
+    serializes access to the connection.
+
+    Attributes:
+        path (str): The database file.
+        executor: BlockingExecutor (class `BlockingExecutor`)
+            The worker all queries run on.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.executor = BlockingExecutor(max_workers=1, name="archive")
+        self._db = None
+
+    def _connect(self):
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.executescript(SCHEMA)
+        return self._db
+
+    async def _run(self, func, *args):
+        return await self.executor.run(lambda: func(self._connect(), *args))
+
+    async def latest_id(self):
+        """The newest archived tweet ID, `None` if the archive is empty."""
+
+        def query(db):
+            return db.execute("SELECT MAX(id) FROM tweets").fetchone()[0]
+
+        return await self._run(query)
+
+    async def add(self, tweets):
+        """Archive tweets, ignoring any already archived.
+
+        Parameters:
+            tweets (iterable): Tweepy `Status` objects.
+        """
+        rows = [(x.id, _epoch(x.created_at)) for x in tweets]
+
+        def insert(db):
+            with db:
+                db.executemany(
+                    "INSERT OR IGNORE INTO tweets (id, created_at) VALUES (?, ?)", rows
+                )
+
+        await self._run(insert)
+
+    async def mark_deleted(self, tweet_ids):
+        """Mark tweets as deleted.
+
+        Parameters:
+            tweet_ids (iterable): IDs of tweets removed from Twitter.
+        """
+        rows = [(x,) for x in tweet_ids]
+
+        def update(db):
+            with db:
+                db.executemany("UPDATE tweets SET deleted = 1 WHERE id = ?", rows)
+
+        await self._run(update)
+
+    async def expired(self, cutoff: datetime):
+        """IDs of live tweets created before `cutoff`, newest first.
+
+        Parameters:
+            cutoff (datetime): Naive UTC datetime.
+
+        Returns:
+            tweet_ids (list): Tweet IDs to delete.
+        """
+
+        def query(db):
+            rows = db.execute(
+                "SELECT id FROM tweets WHERE deleted = 0 AND created_at < ? "
+                "ORDER BY created_at DESC",
+                (_epoch(cutoff),),
+            )
+            return [x for x, in rows]
+
+        return await self._run(query)
+
+    async def counts(self):
+        """Archived tweets.
+
+        Returns:
+            counts (dict): `live` and `deleted` tweet counts.
+        """
+
+        def query(db):
+            rows = dict(
+                db.execute("SELECT deleted, COUNT(*) FROM tweets GROUP BY deleted")
+            )
+            return {"live": rows.get(0, 0), "deleted": rows.get(1, 0)}
+
+        return await self._run(query)
+
+    async def sync(self, client, page_size: int = 200):
+        """Archive every tweet posted since the newest archived one.
+
+        Parameters:
+            client: TwitterClient (class `TwitterClient`)
+                Client the timeline calls run on.
+            page_size (int): Default 200, tweets per request.
+
+        Returns:
+            added (int): Tweets fetched.
+        """
+        since_id = await self.latest_id()
+        max_id = None
+        # Everything is stored at the end, a sync that fails halfway must not
+        # move the `since_id` cursor past tweets it never reached.
+        fetched = []
+        while True:
+            page = await client.run(
+                "statuses/user_timeline",
+                lambda api: api.user_timeline(
+                    count=page_size, since_id=since_id, max_id=max_id, trim_user=True
+                ),
+            )
+            if not page:
+                break
+            fetched.extend(page)
+            max_id = min(x.id for x in page) - 1
+        await self.add(fetched)
+        return len(fetched)
+
+    def close(self):
+        """Stop the worker and close the database."""
+        self.executor.shutdown()
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,175 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Bounded in-memory cache with per-entry expiry.
+
+    Entries are evicted least-recently-used once `maxsize` is reached.
+    Expired entries are kept for a further `stale_ttl` seconds so that
+    `get_or_fetch` can answer immediately with the stale value while a
+    background task refreshes it (stale-while-revalidate).
+
+    Attributes:
+        maxsize (int): Maximum number of entries held.
+        ttl (float): Default number of seconds an entry is fresh.
+        stale_ttl (float): Seconds an expired entry may still be served while refreshing.
+        hits (int): Lookups answered with a fresh entry.
+        stale_hits (int): Lookups answered with a stale entry.
+        misses (int): Lookups that had to wait for the upstream fetch.
+        evictions (int): Entries dropped to stay within `maxsize`.
+    """
+
+    def __init__(
+        self, maxsize: int = 256, ttl: float = 300.0, stale_ttl: float = None
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = ttl if stale_ttl is None else stale_ttl
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._refreshing = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return self._lookup(key) is not None
+
+    def _lookup(self, key):
+        """Return the `(value, expires_at)` entry for `key` unless it is past its stale window."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() > entry[1] + self.stale_ttl:
+            del self._entries[key]
+            return None
+        return entry
+
+    def peek(self, key, default=None):
+        """Return a cached value, fresh or stale, without touching counters or LRU order.
+
+        Parameters:
+            key (hashable): The cache key.
+            default (any): Default `None`, returned when nothing is cached.
+
+        Returns:
+            value (any): The cached value or `default`.
+        """
+        entry = self._lookup(key)
+        return default if entry is None else entry[0]
+
+    def get(self, key, default=None):
+        """Return a fresh cached value, counting the lookup as a hit or miss.
+
+        Parameters:
+            key (hashable): The cache key.
+            default (any): Default `None`, returned when nothing fresh is cached.
+
+        Returns:
+            value (any): The cached value or `default`.
+        """
+        entry = self._lookup(key)
+        if entry is None or time.monotonic() > entry[1]:
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def ttl_remaining(self, key):
+        """Seconds until `key` goes stale, `0` if it is stale or missing."""
+        entry = self._lookup(key)
+        return 0 if entry is None else max(0.0, entry[1] - time.monotonic())
+
+    def set(self, key, value, ttl: float = None):
+        """Store a value.
+
+        Parameters:
+            key (hashable): The cache key.
+            value (any): The value to store.
+            ttl (float): Default `None` uses the cache `ttl`.
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key):
+        """Drop a key from the cache if present."""
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every entry, keeping the counters."""
+        self._entries.clear()
+
+    async def get_or_fetch(self, key, fetch, ttl: float = None):
+        """Return a cached value or fetch and store it.
+
+        Fresh entries are returned directly. Stale entries are returned directly
+        and refreshed in the background. Missing entries are fetched and awaited.
+
+        Parameters:
+            key (hashable): The cache key.
+            fetch (coroutine function): Called with no arguments to produce the value.
+            ttl (float): Default `None` uses the cache `ttl`.
+
+        Returns:
+            value (any): The cached or freshly fetched value.
+        """
+        entry = self._lookup(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            value, expires_at = entry
+            if time.monotonic() <= expires_at:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                self._revalidate(key, fetch, ttl)
+            return value
+
+        self.misses += 1
+        value = await fetch()
+        self.set(key, value, ttl)
+        return value
+
+    def _revalidate(self, key, fetch, ttl):
+        """Refresh `key` in the background, at most one refresh per key at a time."""
+        if key in self._refreshing:
+            return
+
+        async def refresh():
+            try:
+                self.set(key, await fetch(), ttl)
+            except Exception:
+                # Keep serving the stale value, the next lookup will retry.
+                pass
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.ensure_future(refresh())
+
+    def stats(self):
+        """Cache counters for sizing.
+
+        Returns:
+            stats (dict): Size, capacity, hits, stale hits, misses, evictions and hit ratio.
+        """
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 3)
+            if lookups
+            else 0.0,
+        }
@@ -0,0 +1,210 @@
+from bisect import bisect_left, insort
+
+import discord
+
+
+class NameIndex:
+    """Case-insensitive name index over Discord objects.
+
+    Objects are keyed by ID and by their case-folded names, with the folded
+    names also kept sorted for prefix search. Objects are stored by reference,
+    so attributes discord.py updates in place (positions, topics) stay current
+    and only renames need to be re-indexed.
+
+    Attributes:
+        keys (callable): Returns the names an object is found under.
+        order (callable): Default `None` keeps insertion order, otherwise the sort
+                        key used when iterating.
+    """
+
+    def __init__(self, keys=None, order=None):
+        self.keys = keys or (lambda x: (x.name,))
+        self.order = order
+        self._by_id = {}
+        self._names_of = {}
+        self._by_name = {}
+        self._sorted = []
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self):
+        if self.order is None:
+            return iter(list(self._by_id.values()))
+        return iter(sorted(self._by_id.values(), key=self.order))
+
+    def __contains__(self, obj):
+        return obj.id in self._by_id
+
+    def add(self, obj):
+        """Index `obj`, re-indexing its names if it is already present."""
+        if obj.id in self._by_id:
+            self.remove(obj)
+        names = {x.casefold() for x in self.keys(obj) if x}
+        self._by_id[obj.id] = obj
+        self._names_of[obj.id] = names
+        for name in names:
+            holders = self._by_name.get(name)
+            if holders is None:
+                holders = self._by_name[name] = {}
+                insort(self._sorted, name)
+            holders[obj.id] = obj
+
+    def remove(self, obj):
+        """Drop `obj` from the index, if present."""
+        if self._by_id.pop(obj.id, None) is None:
+            return
+        for name in self._names_of.pop(obj.id):
+            holders = self._by_name[name]
+            del holders[obj.id]
+            if not holders:
+                del self._by_name[name]
+                del self._sorted[bisect_left(self._sorted, name)]
+
+    def get(self, name: str):
+        """Find an object by name, case-insensitively.
+
+        An exact-case match wins when several objects share a folded name.
+
+        Returns:
+            obj (any): The matching object, `None` if there is none.
+        """
+        holders = self._by_name.get(name.casefold())
+        if not holders:
+            return None
+        for x in holders.values():
+            if name in self.keys(x):
+                return x
+        return next(iter(holders.values()))
+
+    def get_by_id(self, object_id: int):
+        """Find an indexed object by ID."""
+        return self._by_id.get(object_id)
+
+    def search(self, prefix: str, limit: int = 25):
+        """Objects with a name starting with `prefix`, case-insensitively.
+
+        Returns:
+            objects (list): Up to `limit` matches, ordered by name.
+        """
+        prefix = prefix.casefold()
+        found = {}
+        i = bisect_left(self._sorted, prefix)
+        while i < len(self._sorted) and len(found) < limit:
+            name = self._sorted[i]
+            if not name.startswith(prefix):
+                break
+            for object_id, obj in self._by_name[name].items():
+                found.setdefault(object_id, obj)
+            i += 1
+        return list(found.values())[:limit]
+
+
+def _position(x):
+    return (x.position, x.id)
+
+
+class GuildDirectory:
+    """Name indexes of one guild's roles, channels, categories and members.
+
+    Attributes:
+        roles: NameIndex (class `NameIndex`)
+            Roles, iterated in role hierarchy order.
+        text_channels: NameIndex (class `NameIndex`)
+            Text channels, iterated in channel order.
+        voice_channels: NameIndex (class `NameIndex`)
+            Voice channels, iterated in channel order.
+        categories: NameIndex (class `NameIndex`)
+            Categories, iterated in channel order.
+        members: NameIndex (class `NameIndex`)
+            Members, found by username or nickname.
+    """
+
+    def __init__(self, guild):
+        self.roles = NameIndex(order=_position)
+        self.text_channels = NameIndex(order=_position)
+        self.voice_channels = NameIndex(order=_position)
+        self.categories = NameIndex(order=_position)
+        self.members = NameIndex(keys=lambda x: (x.name, x.nick))
+        for x in guild.roles:
+            self.roles.add(x)
+        for x in guild.channels:
+            self.add_channel(x)
+        for x in guild.members:
+            self.members.add(x)
+
+    def _channel_index(self, channel):
+        if isinstance(channel, discord.TextChannel):
+            return self.text_channels
+        if isinstance(channel, discord.VoiceChannel):
+            return self.voice_channels
+        if isinstance(channel, discord.CategoryChannel):
+            return self.categories
+        return None
+
+    def add_channel(self, channel):
+        index = self._channel_index(channel)
+        if index is not None:
+            index.add(channel)
+
+    def remove_channel(self, channel):
+        index = self._channel_index(channel)
+        if index is not None:
+            index.remove(channel)
+
+
+class DirectoryIndex:
+    """Per-guild directories, built on first use and kept current from events.
+
+    A guild's directory is built from its cache the first time it is needed.
+    From then on `GeneralCog`'s gateway event listeners apply each create,
+    update, delete, join and leave incrementally, so lookups and listings never
+    scan the guild's collections.
+    """
+
+    def __init__(self):
+        self._guilds = {}
+
+    def get(self, guild):
+        """Return the directory of `guild`, building it if needed.
+
+        Returns:
+            directory (class GuildDirectory): The guild's indexes.
+        """
+        directory = self._guilds.get(guild.id)
+        if directory is None:
+            directory = self._guilds[guild.id] = GuildDirectory(guild)
+        return directory
+
+    def _built(self, guild):
+        """The directory of `guild` if it has been built, else `None`.
+
+        Events for guilds nobody has looked up yet are ignored, the directory
+        is built from the already-updated cache on first use.
+        """
+        return self._guilds.get(guild.id) if guild is not None else None
+
+    def drop(self, guild):
+        """Forget a guild's directory, e.g. after leaving it."""
+        self._guilds.pop(guild.id, None)
+
+    def role_changed(self, role, deleted: bool = False):
+        """Apply a role create, update or delete event."""
+        directory = self._built(role.guild)
+        if directory is not None:
+            (directory.roles.remove if deleted else directory.roles.add)(role)
+
+    def channel_changed(self, channel, deleted: bool = False):
+        """Apply a channel create, update or delete event."""
+        directory = self._built(getattr(channel, "guild", None))
+        if directory is not None:
+            if deleted:
+                directory.remove_channel(channel)
+            else:
+                directory.add_channel(channel)
+
+    def member_changed(self, member, left: bool = False):
+        """Apply a member join, update or leave event."""
+        directory = self._built(member.guild)
+        if directory is not None:
+            (directory.members.remove if left else directory.members.add)(member)
@@ -0,0 +1,44 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BlockingExecutor:
+    """Bounded worker pool for blocking SDK calls.
+
+    Synchronous client libraries (PRAW, Tweepy) must never run on the event
+    loop. Work submitted here runs on a dedicated, bounded set of threads so a
+    slow provider can only tie up its own workers, never the gateway heartbeat
+    or the default executor used by discord.py.
+
+    Attributes:
+        max_workers (int): Maximum number of worker threads.
+        name (str): Prefix for worker thread names.
+    """
+
+    def __init__(self, max_workers: int = 4, name: str = "worker"):
+        self.max_workers = max_workers
+        self.name = name
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=name
+        )
+
+    async def run(self, func, *args, **kwargs):
+        """Run a blocking callable on the pool and await its result.
+
+        Parameters:
+            func (callable): The blocking function.
+            args (*): Positional arguments for `func`.
+            kwargs (**): Keyword arguments for `func`.
+
+        Returns:
+            result (any): The return value of `func`.
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self._pool, functools.partial(func, *args, **kwargs)
+        )
+
+    def shutdown(self):
+        """Stop accepting work, running calls are allowed to finish."""
+        self._pool.shutdown(wait=False)
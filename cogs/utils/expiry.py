@@ -0,0 +1,225 @@
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+
+import tweepy
+
+log = logging.getLogger(__name__)
+
+# Tweet IDs are snowflakes: milliseconds since this epoch, shifted left 22 bits.
+TWITTER_EPOCH_MS = 1288834974657
+# "No status found with that ID", the tweet is already gone.
+STATUS_NOT_FOUND = 144
+
+
+def snowflake_at(date: datetime):
+    """The smallest tweet ID that could have been created at `date` (UTC)."""
+    ms = int(date.replace(tzinfo=timezone.utc).timestamp() * 1000)
+    return max(ms - TWITTER_EPOCH_MS, 0) << 22
+
+
+class TweetExpiry:
+    """Resumable bulk deletion of the authenticated user's old tweets.
+
+    With a `TimelineArchive`, the archive is synced (only tweets newer than
+    its newest entry are fetched) and the tweets to delete are planned with a
+    single indexed query. Deleted tweets are marked in the archive after every
+    batch, so a rerun simply plans what is left.
+
+    Without one, the timeline is paged with `max_id`, starting at the newest
+    tweet ID that could be older than the cutoff so newer tweets are never
+    fetched, and the next page is fetched while the current one is deleted.
+    The cursor is written to a checkpoint file after every page, so a rerun
+    with the same `days` resumes below the last completed page. The cutoff has
+    moved by then, so the tweets that aged past it since the checkpoint (newer
+    than its cutoff) are paged with `since_id` first.
+
+    Either way deletions run with bounded concurrency through the
+    `TwitterClient` (and so within its rate budgets). A dry run never deletes,
+    checkpoints or marks anything.
+
+    Attributes:
+        client: TwitterClient (class `TwitterClient`)
+            Client the timeline and destroy calls run on.
+        days (int): Tweets older than this many days are deleted.
+        cutoff (datetime): Tweets created before this (UTC) are deleted.
+        archive: TimelineArchive (class `TimelineArchive`)
+            Default `None`, plans deletions from the local archive.
+        checkpoint (str): Default `None`, checkpoint file used without an archive.
+        concurrency (int): Deletions in flight at once.
+        dry_run (bool): Count eligible tweets without deleting them.
+        scanned (int): Tweets paged (or planned from the archive) so far.
+        deleted (int): Tweets deleted (or found eligible, in a dry run) so far.
+        failed (int): Deletions that failed.
+        resumed (bool): The run continued from a checkpoint.
+        done (bool): Every eligible tweet has been handled.
+    """
+
+    def __init__(
+        self,
+        client,
+        days: int,
+        archive=None,
+        checkpoint: str = None,
+        concurrency: int = 4,
+        dry_run: bool = False,
+        page_size: int = 200,
+    ):
+        self.client = client
+        self.days = days
+        self.cutoff = datetime.utcnow() - timedelta(days=days)
+        self.archive = archive
+        self.checkpoint = checkpoint
+        self.concurrency = concurrency
+        self.dry_run = dry_run
+        self.page_size = page_size
+        self.scanned = 0
+        self.deleted = 0
+        self.failed = 0
+        self.resumed = False
+        self.done = False
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    def status(self):
+        """One line describing the run's progress."""
+        verb = "eligible" if self.dry_run else "deleted"
+        state = "done" if self.done else "running"
+        resumed = ", resumed from checkpoint" if self.resumed else ""
+        return (
+            f"**Expiring tweets older than {self.days} day(s)** ({state}{resumed})\n"
+            f"scanned {self.scanned}, {verb} {self.deleted}, failed {self.failed}"
+        )
+
+    def _load(self):
+        """The saved cursor for this run, `None` if there is nothing to resume."""
+        if self.checkpoint is None:
+            return None
+        try:
+            with open(self.checkpoint) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get("days") != self.days:
+            return None
+        return state
+
+    def _save(self, max_id: int):
+        """Atomically record that every tweet between `max_id` and the cutoff
+        is handled."""
+        if self.checkpoint is None or max_id is None:
+            return
+        os.makedirs(os.path.dirname(self.checkpoint) or ".", exist_ok=True)
+        state = {
+            "days": self.days,
+            "cutoff_id": snowflake_at(self.cutoff),
+            "max_id": max_id,
+            "deleted": self.deleted,
+            "failed": self.failed,
+        }
+        temp = f"{self.checkpoint}.tmp"
+        with open(temp, "w") as f:
+            json.dump(state, f)
+        os.replace(temp, self.checkpoint)
+
+    def _clear(self):
+        if self.checkpoint is None:
+            return
+        try:
+            os.remove(self.checkpoint)
+        except FileNotFoundError:
+            pass
+
+    async def _page(self, max_id: int, since_id: int = None):
+        return await self.client.run(
+            "statuses/user_timeline",
+            lambda api: api.user_timeline(
+                count=self.page_size, max_id=max_id, since_id=since_id, trim_user=True
+            ),
+        )
+
+    async def _planned(self):
+        """Batches of expired tweet IDs from the archive, with no cursor."""
+        await self.archive.sync(self.client, page_size=self.page_size)
+        tweet_ids = await self.archive.expired(self.cutoff)
+        self.scanned = len(tweet_ids)
+        for i in range(0, len(tweet_ids), self.page_size):
+            yield tweet_ids[i : i + self.page_size], None
+
+    async def _paged(self):
+        """Batches of expired tweet IDs paged from the timeline, with the
+        `max_id` cursor below each batch (`None` while it cannot be saved)."""
+        top = snowflake_at(self.cutoff)
+        ranges = [(top, None)]
+        state = None if self.dry_run else self._load()
+        if state is not None:
+            self.deleted = state["deleted"]
+            self.failed = state["failed"]
+            self.resumed = True
+            ranges = [(state["max_id"], None)]
+            cutoff_id = state.get("cutoff_id", top)
+            # Tweets that expired since the checkpoint, above everything it covers.
+            if cutoff_id < top:
+                ranges.insert(0, (top, cutoff_id))
+
+        for max_id, since_id in ranges:
+            next_page = asyncio.ensure_future(self._page(max_id, since_id))
+            try:
+                while True:
+                    page = await next_page
+                    if not page:
+                        break
+                    max_id = min(x.id for x in page) - 1
+                    # The next page is fetched while this one is deleted.
+                    next_page = asyncio.ensure_future(self._page(max_id, since_id))
+                    self.scanned += len(page)
+                    expired = [x.id for x in page if x.created_at < self.cutoff]
+                    # The old checkpoint stays valid until its band is done.
+                    yield expired, max_id if since_id is None else None
+            finally:
+                if not next_page.done():
+                    next_page.cancel()
+
+    async def _destroy(self, tweet_id: int):
+        """Delete a tweet, returning `True` once it is gone."""
+        async with self._semaphore:
+            try:
+                await self.client.run(
+                    "statuses/destroy/:id", lambda api: api.destroy_status(tweet_id)
+                )
+            except tweepy.TweepError as exc:
+                if getattr(exc, "api_code", None) != STATUS_NOT_FOUND:
+                    self.failed += 1
+                    log.warning("Could not delete tweet %s: %s", tweet_id, exc)
+                    return False
+            self.deleted += 1
+            return True
+
+    async def run(self, on_progress=None):
+        """Delete every eligible tweet.
+
+        Parameters:
+            on_progress (coroutine function): Default `None`, awaited with the job
+                                            after every batch.
+        """
+        batches = self._planned() if self.archive is not None else self._paged()
+        try:
+            async for tweet_ids, cursor in batches:
+                if self.dry_run:
+                    self.deleted += len(tweet_ids)
+                else:
+                    gone = await asyncio.gather(*(self._destroy(x) for x in tweet_ids))
+                    if self.archive is not None:
+                        await self.archive.mark_deleted(
+                            x for x, ok in zip(tweet_ids, gone) if ok
+                        )
+                    else:
+                        self._save(cursor)
+                if on_progress is not None:
+                    await on_progress(self)
+        finally:
+            await batches.aclose()
+        self.done = True
+        if not self.dry_run:
+            self._clear()
@@ -1,26 +1,59 @@
+import textwrap
+
 import discord
 from discord.ext import commands
 
+FENCE = "```"
+
+
 class Helpers(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
 
-    def break_message(text: str, wrap_at: int = 40, limit: int = 2000):
-        """Breaks long text from lines.
-        
-        Breaks text into 2,000 character chunks for Discord messages.
-        Creates a pseudo "max-width" with `wrap_at`.
-        
+    @staticmethod
+    def break_message(text, wrap_at: int = 40, limit: int = 2000):
+        """Breaks long text into message-sized chunks, line by line.
+
+        Lines are packed whole into chunks of at most `limit` characters and
+        lines wider than `wrap_at` are wrapped into a pseudo "max-width" column.
+        A chunk that ends inside a code block is closed with a fence and the
+        next chunk reopens it, so every chunk renders on its own.
+
+        Chunks are yielded as they fill, the whole text is never joined, so
+        memory stays constant however many lines are given.
+
         Parameters:
-            text (str): Text to break up.
-            wrap_at (int): Default 40, the "width" of the column to create.
+            text (str or iterable): Text to break up, or any iterable of lines or
+                                    records (converted with `str`).
+            wrap_at (int): Default 40, the "width" of the column to create,
+                        `None` keeps lines as they are.
             limit (int): Default to 2,000 for the Discord character limit.
+
+        Yields:
+            chunk (str): Up to `limit` characters of whole lines.
         """
-        messages = []
-        for x in [text[i:i+limit] for i in range(0, len(text), limit)]:
-           messages.append(x)
-        return messages 
+        lines = text.splitlines() if isinstance(text, str) else text
+        packer = _ChunkPacker(wrap_at, limit)
+        for record in lines:
+            yield from packer.feed(record)
+        yield from packer.finish()
+
+    @staticmethod
+    async def break_message_async(lines, wrap_at: int = 40, limit: int = 2000):
+        """`break_message` for an async iterable of lines, e.g. `fetch_members`.
+
+        Lines are pulled only as chunks are consumed.
+
+        Yields:
+            chunk (str): Up to `limit` characters of whole lines.
+        """
+        packer = _ChunkPacker(wrap_at, limit)
+        async for record in lines:
+            for chunk in packer.feed(record):
+                yield chunk
+        for chunk in packer.finish():
+            yield chunk
 
     def truncate_text(text: str, trunc_at: int = 40):
         """Add elipses on long messages.
@@ -39,3 +72,56 @@ class Helpers(commands.Cog):
         if len(text) > trunc_at:
             return text[:trunc_at]
         return text
+
+
+class _ChunkPacker:
+    """Incremental state of `Helpers.break_message`, one record at a time."""
+
+    def __init__(self, wrap_at: int, limit: int):
+        self.wrap_at = wrap_at
+        self.limit = limit
+        self.chunk = []
+        self.size = 0
+        self.opened = None
+
+    def feed(self, record):
+        """Add a record, returning the chunks it filled."""
+        full = []
+        for line in self._wrap(str(record)):
+            is_fence = line.lstrip().startswith(FENCE)
+            inside = (self.opened is None) == is_fence
+            # Room for the closing fence whenever the chunk ends in a block.
+            needed = self.size + len(line) + (len(FENCE) + 1 if inside else 0)
+            reopen_only = self.opened is not None and len(self.chunk) == 1
+            if self.chunk and needed > self.limit and not reopen_only:
+                if self.opened is not None:
+                    self.chunk.append(FENCE)
+                full.append("\n".join(self.chunk))
+                self.chunk = [self.opened] if self.opened is not None else []
+                self.size = len(self.opened) + 1 if self.opened is not None else 0
+            self.chunk.append(line)
+            self.size += len(line) + 1
+            if is_fence:
+                self.opened = None if self.opened is not None else line.strip()
+        return full
+
+    def finish(self):
+        """The last, partly filled chunk, if any."""
+        chunk = self.chunk
+        self.chunk, self.size = [], 0
+        if not chunk or (self.opened is not None and len(chunk) == 1):
+            return []
+        if self.opened is not None:
+            chunk.append(FENCE)
+        return ["\n".join(chunk)]
+
+    def _wrap(self, line: str):
+        """Wrap one line to `wrap_at` columns, hard splitting anything that
+        still cannot fit in a chunk next to a code fence."""
+        width = self.limit - 2 * len(FENCE) - 16
+        pieces = [line]
+        if self.wrap_at and len(line) > self.wrap_at:
+            pieces = textwrap.wrap(line, self.wrap_at) or [line]
+        for piece in pieces:
+            for i in range(0, max(len(piece), 1), width):
+                yield piece[i : i + width]
@@ -0,0 +1,75 @@
+import aiohttp
+
+
+class HTTPClient:
+    """Pooled asynchronous HTTP client.
+
+    Wraps a single long-lived `aiohttp.ClientSession` so cogs share keep-alive
+    connections instead of opening a new socket (and blocking the event loop)
+    for every request. The session is created lazily on first use so it is always
+    bound to the running event loop.
+
+    Attributes:
+        limit (int): Maximum number of open connections across all hosts.
+        limit_per_host (int): Maximum number of open connections to a single host.
+        timeout (aiohttp.ClientTimeout): Total and connect timeouts for each request.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        total_timeout: float = 10.0,
+        connect_timeout: float = 5.0,
+        keepalive_timeout: float = 30.0,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = aiohttp.ClientTimeout(
+            total=total_timeout, connect=connect_timeout
+        )
+        self._session = None
+
+    @property
+    def session(self):
+        """The shared `aiohttp.ClientSession`, created on first access.
+
+        Returns:
+            session (class ClientSession): Session with a pooled `TCPConnector`.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=self.timeout
+            )
+        return self._session
+
+    async def get_json(self, url: str, params: dict = None):
+        """GET a URL and decode the JSON body.
+
+        Parameters:
+            url (str): The URL to request.
+            params (dict): Default `None`, query string parameters.
+
+        Returns:
+            data (dict): The decoded JSON response.
+
+        Raises:
+            aiohttp.ClientResponseError: The response status was 400 or greater.
+            asyncio.TimeoutError: The request exceeded `timeout`.
+        """
+        async with self.session.get(url, params=params) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def close(self):
+        """Close the session and release pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import time
+
+from discord.ext import commands
+
+log = logging.getLogger(__name__)
+
+
+class WarmingUp(commands.CheckFailure):
+    """A command was invoked before its cog finished its remote setup.
+
+    Attributes:
+        cog (str): The cog's name.
+        failed (bool): The setup failed instead of still running.
+    """
+
+    def __init__(self, cog: str, failed: bool = False):
+        self.cog = cog
+        self.failed = failed
+        if failed:
+            message = f"{cog} is unavailable right now, its setup is being retried."
+        else:
+            message = f"{cog} is still warming up, try again in a moment."
+        super().__init__(message)
+
+
+class ReadyCog(commands.Cog):
+    """Cog whose remote setup runs after login instead of in `__init__`.
+
+    Constructors must not touch the network. Remote setup (authentication,
+    looking up the account) goes in `async_setup`, which the bot runs for
+    every cog concurrently once it has logged in, so one slow provider never
+    delays startup or the other cogs. Until it finishes, the cog's commands
+    fail fast with `WarmingUp` instead of blocking.
+
+    A failed setup (e.g. a provider outage at boot) is retried in the
+    background, waiting `retry_delay` seconds and doubling the wait after each
+    failure up to `max_retry_delay`, until it succeeds or the cog is unloaded.
+    Subclasses overriding `cog_unload` must call `super().cog_unload()`.
+
+    Attributes:
+        ready (bool): `async_setup` has completed.
+        setup_failed (bool): The last `async_setup` attempt raised or timed out.
+        setup_seconds (float): How long the last `async_setup` attempt took.
+        setup_attempts (int): `async_setup` attempts made.
+        retry_delay (float): Seconds before the first retry.
+        max_retry_delay (float): Longest wait between retries.
+    """
+
+    ready = False
+    setup_failed = False
+    setup_seconds = None
+    setup_attempts = 0
+    retry_delay = 5.0
+    max_retry_delay = 300.0
+    _setup_retry = None
+
+    async def async_setup(self):
+        """Remote setup, run after login until it succeeds. Override in subclasses."""
+
+    async def start_setup(self, timeout: float = 60.0):
+        """Run `async_setup`, retrying it in the background if it fails."""
+        await self._attempt_setup(timeout)
+        if not self.ready and self._setup_retry is None:
+            self._setup_retry = asyncio.ensure_future(self._retry_setup(timeout))
+
+    async def _retry_setup(self, timeout: float):
+        delay = self.retry_delay
+        try:
+            while not self.ready:
+                log.info("Retrying %s setup in %.0fs", self.qualified_name, delay)
+                await asyncio.sleep(delay)
+                await self._attempt_setup(timeout)
+                delay = min(delay * 2, self.max_retry_delay)
+        finally:
+            self._setup_retry = None
+
+    async def _attempt_setup(self, timeout: float):
+        """Run `async_setup` once, recording its outcome and timing."""
+        self.setup_attempts += 1
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(self.async_setup(), timeout)
+        except Exception:
+            self.setup_failed = True
+            log.exception("%s setup failed", self.qualified_name)
+        else:
+            self.ready = True
+            self.setup_failed = False
+        self.setup_seconds = round(time.monotonic() - started, 2)
+        log.info(
+            "%s %s in %.2fs",
+            self.qualified_name,
+            "ready" if self.ready else "failed",
+            self.setup_seconds,
+        )
+
+    def cog_unload(self):
+        """Stop retrying a failed setup."""
+        if self._setup_retry is not None:
+            self._setup_retry.cancel()
+
+    def cog_check(self, ctx):
+        if not self.ready:
+            raise WarmingUp(self.qualified_name, failed=self.setup_failed)
+        return True
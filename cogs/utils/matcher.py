@@ -0,0 +1,155 @@
+from collections import deque
+
+
+class PhraseMatcher:
+    """Multi-phrase keyword matcher (Aho-Corasick automaton).
+
+    Every watched phrase is compiled into a single automaton so a title or body
+    is scanned once, regardless of how many phrases are watched, and every
+    subscriber with a matching phrase is returned. Matching is case-insensitive
+    substring matching, the same as `phrase in text.lower()`.
+
+    Adding a phrase extends the trie in place and removing one only drops its
+    output; failure links are recomputed lazily on the next `match`. Dead trie
+    nodes left behind by removals are compacted once they outnumber live phrases.
+    """
+
+    def __init__(self):
+        self._subscribers = {}
+        self._reset()
+
+    def __len__(self):
+        return len(self._subscribers)
+
+    def __contains__(self, phrase):
+        return phrase.casefold() in self._subscribers
+
+    def _reset(self):
+        """Start an empty trie with only the root node."""
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [None]
+        self._dict_link = [0]
+        self._removed = 0
+        self._dirty = False
+
+    def _insert(self, phrase: str):
+        """Add the trie path for `phrase` and mark its final node as an output."""
+        node = 0
+        for char in phrase:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(None)
+                self._dict_link.append(0)
+            node = next_node
+        self._output[node] = phrase
+        self._dirty = True
+
+    def _build(self):
+        """Recompute failure and output links breadth-first."""
+        queue = deque()
+        for node in self._goto[0].values():
+            self._fail[node] = 0
+            self._dict_link[node] = 0
+            queue.append(node)
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[child] = fail
+                self._dict_link[child] = (
+                    fail if self._output[fail] is not None else self._dict_link[fail]
+                )
+                queue.append(child)
+        self._dirty = False
+
+    def add(self, phrase: str, subscriber):
+        """Watch `phrase` on behalf of `subscriber`.
+
+        Parameters:
+            phrase (str): The phrase to match, case-insensitive.
+            subscriber (hashable): Returned from `match` when the phrase is found.
+        """
+        phrase = phrase.casefold()
+        if not phrase:
+            return
+        if phrase not in self._subscribers:
+            self._subscribers[phrase] = set()
+            self._insert(phrase)
+        self._subscribers[phrase].add(subscriber)
+
+    def remove(self, phrase: str, subscriber):
+        """Stop watching `phrase` for `subscriber`.
+
+        Parameters:
+            phrase (str): The phrase to stop matching.
+            subscriber (hashable): The subscriber to remove.
+        """
+        phrase = phrase.casefold()
+        subscribers = self._subscribers.get(phrase)
+        if subscribers is None:
+            return
+        subscribers.discard(subscriber)
+        if subscribers:
+            return
+        del self._subscribers[phrase]
+        self._removed += 1
+        if self._removed > len(self._subscribers):
+            self._reset()
+            for x in self._subscribers:
+                self._insert(x)
+        else:
+            node = 0
+            for char in phrase:
+                node = self._goto[node][char]
+            self._output[node] = None
+            self._dirty = True
+
+    def phrases(self, subscriber):
+        """Phrases watched by a subscriber.
+
+        Returns:
+            phrases (set): The subscriber's phrases.
+        """
+        return {x for x, subs in self._subscribers.items() if subscriber in subs}
+
+    def match(self, text: str):
+        """Find every subscriber with a phrase in `text`.
+
+        Parameters:
+            text (str): The title or body to scan.
+
+        Returns:
+            subscribers (set): Subscribers with at least one matching phrase.
+        """
+        if not self._subscribers:
+            return set()
+        if self._dirty:
+            self._build()
+        goto, fail, output, dict_link = (
+            self._goto,
+            self._fail,
+            self._output,
+            self._dict_link,
+        )
+        found = set()
+        node = 0
+        for char in text.casefold():
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            hit = node if output[node] is not None else dict_link[node]
+            while hit:
+                found.add(output[hit])
+                hit = dict_link[hit]
+        matched = set()
+        for phrase in found:
+            matched |= self._subscribers[phrase]
+        return matched
@@ -0,0 +1,121 @@
+from brandobot.vendored import menus
+
+
+class EmbedPageSource(menus.ListPageSource):
+    """One `Embed` per page.
+
+    Entries may be ready-made `Embed` objects or raw data passed through
+    `render`, which is only called for the pages that are actually viewed.
+
+    Attributes:
+        render (callable): Default `None`, turns an entry into an `Embed`.
+        header (str): Default `""`, message content shown above every page.
+    """
+
+    def __init__(self, entries: list, render=None, header: str = ""):
+        super().__init__(entries, per_page=1)
+        self.render = render
+        self.header = header
+
+    async def format_page(self, menu, entry):
+        embed = self.render(entry) if self.render is not None else entry
+        # Page numbers go in the content so cached, shared embeds are never mutated.
+        content = self.header
+        if self.is_paginating():
+            content += f"\nPage {menu.current_page + 1}/{self.get_max_pages()}"
+        return {"content": content.strip() or None, "embed": embed}
+
+
+class TextPageSource(menus.ListPageSource):
+    """One block of text per page, under an optional header.
+
+    Attributes:
+        header (str): Default `""`, shown above every page.
+    """
+
+    def __init__(self, entries: list, header: str = ""):
+        super().__init__(entries, per_page=1)
+        self.header = header
+
+    async def format_page(self, menu, entry):
+        footer = ""
+        if self.is_paginating():
+            footer = f"\nPage {menu.current_page + 1}/{self.get_max_pages()}"
+        return f"{self.header}{entry}{footer}"
+
+
+class LazyTextPageSource(menus.AsyncIteratorPageSource):
+    """Text pages pulled from an iterator only as they are viewed.
+
+    Use with generators such as `Helpers.break_message`, or async ones such
+    as `Helpers.break_message_async`, so only the pages a user actually
+    reaches are ever built.
+
+    Attributes:
+        header (str): Default `""`, shown above every page.
+    """
+
+    def __init__(self, chunks, header: str = ""):
+        if not hasattr(chunks, "__aiter__"):
+            chunks = self._aiter(chunks)
+        super().__init__(chunks, per_page=1)
+        self.header = header
+
+    @staticmethod
+    async def _aiter(chunks):
+        for x in chunks:
+            yield x
+
+    async def format_page(self, menu, entry):
+        footer = f"\nPage {menu.current_page + 1}" if self.is_paginating() else ""
+        return f"{self.header}{entry}{footer}"
+
+
+class LazyEmbedPageSource(menus.AsyncIteratorPageSource):
+    """One `Embed` per page, pulled from an async iterator as pages are viewed.
+
+    Use with streaming sources such as `TwitterClient.paged_timeline`, so the
+    first page shows while later entries are still loading.
+
+    Attributes:
+        header (str): Default `""`, message content shown above every page.
+    """
+
+    def __init__(self, embeds, header: str = ""):
+        super().__init__(embeds, per_page=1)
+        self.header = header
+
+    async def format_page(self, menu, entry):
+        content = self.header
+        if self.is_paginating():
+            content += f"\nPage {menu.current_page + 1}"
+        return {"content": content.strip() or None, "embed": entry}
+
+
+async def paginate(ctx, source, dm: bool = False):
+    """Send a page source as a single message that is edited as users react.
+
+    A source without any entries sends "Nothing to show." instead of a menu.
+
+    Parameters:
+        ctx (class Context): The invocation context.
+        source (class PageSource): The pages to show.
+        dm (bool): Default `False`, send to the author's DMs instead of the channel.
+
+    Returns:
+        menu (class MenuPages): The running menu, `None` when there was nothing
+                                to show.
+    """
+    channel = None
+    if dm:
+        channel = ctx.author.dm_channel or await ctx.author.create_dm()
+    # Prepared once here, the menu does not prepare the source again.
+    await source._prepare_once()
+    try:
+        await source.get_page(0)
+    except IndexError:
+        await (channel or ctx).send("Nothing to show.")
+        return None
+    menu = menus.MenuPages(source, clear_reactions_after=True)
+    await menu.start(ctx, channel=channel)
+    return menu
@@ -0,0 +1,199 @@
+import asyncio
+import time
+
+from discord.ext import commands
+
+
+class RateLimited(commands.CommandError):
+    """A provider call was rejected locally because its budget is spent.
+
+    Attributes:
+        name (str): The rate-limited endpoint.
+        retry_after (float): Seconds until the budget resets.
+    """
+
+    def __init__(self, name: str, retry_after: float):
+        self.name = name
+        self.retry_after = retry_after
+        minutes, seconds = divmod(int(retry_after) + 1, 60)
+        super().__init__(
+            f"{name} is rate limited, try again in {minutes}m {seconds}s."
+        )
+
+
+class RateLimitBudget:
+    """Remaining requests of one rate-limited endpoint.
+
+    The budget is learned from the rate-limit headers of each response, so it
+    is unknown (and never blocks) until the endpoint has been called once.
+    Calls reserve a request before they are sent, so concurrent callers do not
+    all spend the last request of a window.
+
+    Attributes:
+        name (str): The endpoint, e.g. "lists/statuses".
+        limit (int): Requests allowed per window, `None` until known.
+        remaining (int): Requests left in the current window, `None` until known.
+        reset (float): Epoch time the window resets, `None` until known.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.limit = None
+        self.remaining = None
+        self.reset = None
+
+    def update(self, limit=None, remaining=None, reset=None):
+        """Record the budget reported by the provider."""
+        if limit is not None:
+            self.limit = int(limit)
+        if remaining is not None:
+            self.remaining = int(remaining)
+        if reset is not None:
+            self.reset = float(reset)
+
+    def update_from_headers(self, headers, prefix: str = "x-rate-limit-"):
+        """Record the budget from `{prefix}limit`, `remaining` and `reset` headers.
+
+        Parameters:
+            headers (Mapping): Case-insensitive response headers, may be `None`.
+            prefix (str): Default "x-rate-limit-", the header prefix.
+        """
+        if not headers:
+            return
+        self.update(
+            headers.get(f"{prefix}limit"),
+            headers.get(f"{prefix}remaining"),
+            headers.get(f"{prefix}reset"),
+        )
+
+    def record(self, limit: int, window: float):
+        """Count a request against a locally tracked fixed window.
+
+        For providers that do not report their budget in response headers.
+
+        Parameters:
+            limit (int): Requests allowed per window.
+            window (float): Window length in seconds.
+        """
+        now = time.time()
+        if self.reset is None or now >= self.reset:
+            self.update(limit, limit, now + window)
+        self.remaining = max(self.remaining - 1, 0)
+
+    def exhaust(self, retry_after: float = None):
+        """Mark the budget as spent, e.g. after a 429."""
+        self.remaining = 0
+        if retry_after is not None:
+            self.reset = time.time() + retry_after
+
+    def delay(self):
+        """Seconds until a request may be made, `0` if one may be made now."""
+        if self.remaining is None or self.remaining > 0:
+            return 0.0
+        now = time.time()
+        if self.reset is None or now >= self.reset:
+            # The window has reset, the next response reports the new budget.
+            self.remaining = self.limit
+            return 0.0
+        return self.reset - now
+
+    def snapshot(self):
+        """The budget as plain data.
+
+        Returns:
+            budget (dict): `limit`, `remaining` and `reset_in` seconds, `None` when
+                        unknown.
+        """
+        reset_in = None
+        if self.reset is not None:
+            reset_in = max(round(self.reset - time.time()), 0)
+        return {"limit": self.limit, "remaining": self.remaining, "reset_in": reset_in}
+
+    async def acquire(self, max_wait: float):
+        """Reserve a request, waiting for the window to reset if needed.
+
+        Parameters:
+            max_wait (float): Longest wait accepted before rejecting the call.
+
+        Raises:
+            RateLimited: The budget does not reset within `max_wait` seconds.
+        """
+        delay = self.delay()
+        while delay > 0:
+            if delay > max_wait:
+                raise RateLimited(self.name, delay)
+            await asyncio.sleep(delay)
+            delay = self.delay()
+        if self.remaining is not None:
+            self.remaining -= 1
+
+
+class RateLimitRegistry:
+    """Bot-wide, in-memory rate-limit budgets of every provider.
+
+    Budgets are filled in passively as provider clients read their responses,
+    so reporting them costs no upstream requests.
+
+    Attributes:
+        providers (dict): Provider name to `{endpoint: RateLimitBudget}`.
+    """
+
+    def __init__(self):
+        self.providers = {}
+
+    @classmethod
+    def for_bot(cls, bot):
+        """Return the bot-wide registry, creating it on first use.
+
+        Parameters:
+            bot: BrandoBot (class `BrandoBot`)
+                Instance of the BrandoBot client.
+
+        Returns:
+            registry (class RateLimitRegistry): The registry shared by every cog.
+        """
+        registry = getattr(bot, "rate_limits", None)
+        if registry is None:
+            registry = bot.rate_limits = cls()
+        return registry
+
+    def provider(self, name: str):
+        """The endpoint budgets of a provider, a dict clients may add to."""
+        return self.providers.setdefault(name, {})
+
+    def budget(self, provider: str, endpoint: str):
+        """The budget of a provider endpoint, created on first use."""
+        budgets = self.provider(provider)
+        budget = budgets.get(endpoint)
+        if budget is None:
+            budget = budgets[endpoint] = RateLimitBudget(endpoint)
+        return budget
+
+    def snapshot(self):
+        """Every known budget as plain data.
+
+        Returns:
+            budgets (dict): Provider to endpoint to `RateLimitBudget.snapshot()`.
+        """
+        return {
+            provider: {name: x.snapshot() for name, x in sorted(budgets.items())}
+            for provider, budgets in sorted(self.providers.items())
+        }
+
+    def summary(self):
+        """Render every known budget, one endpoint per line.
+
+        Yields:
+            line (str): A provider name, or an endpoint's remaining requests and
+                        time until its window resets.
+        """
+        for provider, budgets in self.snapshot().items():
+            yield provider
+            for name, x in budgets.items():
+                used = f"{x['remaining']}/{x['limit']}"
+                if x["remaining"] is None:
+                    used = "unknown"
+                reset = ""
+                if x["reset_in"] is not None:
+                    reset = "resets in {}m {}s".format(*divmod(x["reset_in"], 60))
+                yield f"  {name:<28} {used:>9}  {reset}".rstrip()
@@ -0,0 +1,379 @@
+import threading
+from collections import Counter
+from contextvars import ContextVar
+from itertools import islice
+
+import praw
+import prawcore
+from praw.models import MoreComments
+
+import settings
+from cogs.utils.cache import TTLCache
+from cogs.utils.executor import BlockingExecutor
+from cogs.utils.ratelimit import RateLimitBudget, RateLimitRegistry
+from cogs.utils.singleflight import SingleFlight
+
+
+class CountingRequestor(prawcore.Requestor):
+    """prawcore requestor that reports every HTTP request it makes.
+
+    Parameters:
+        on_request (callable): Called with no arguments before each request.
+    """
+
+    def __init__(self, *args, on_request=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._on_request = on_request
+
+    def request(self, *args, **kwargs):
+        if self._on_request is not None:
+            self._on_request()
+        return super().request(*args, **kwargs)
+
+
+class RedditClient:
+    """Managed, shareable PRAW client.
+
+    PRAW is synchronous and not thread safe, so every call is handed to a
+    dedicated bounded worker pool and each worker thread lazily builds its own
+    `praw.Reddit` instance. Work is submitted as a function taking the worker's
+    `praw.Reddit`, which keeps lazy objects (listings, comment forests) on the
+    thread that created them. Objects that outlive a single call (e.g. a comment
+    cursor) are continued with `run_on`, which locks the instance that created
+    them so two threads never use one `praw.Reddit` at the same time.
+
+    Every HTTP request PRAW makes is counted against the label of the work
+    that caused it (usually the command name, see `track`), which makes N+1
+    lazy-fetch regressions visible. The OAuth rate limit PRAW reads from
+    Reddit's `x-ratelimit-*` headers is copied into `budget` after every call.
+
+    Attributes:
+        executor: BlockingExecutor (class `BlockingExecutor`)
+            Worker pool all Reddit calls run on.
+        label: ContextVar
+            Label requests are counted against, set per command or task.
+        requests (Counter): HTTP requests made per label.
+        invocations (Counter): Times each label was tracked.
+        budget: RateLimitBudget (class `RateLimitBudget`)
+            Reddit's per-client OAuth rate limit.
+    """
+
+    def __init__(self, max_workers: int = 4, budget=None):
+        self.executor = BlockingExecutor(max_workers=max_workers, name="reddit")
+        self.label = ContextVar("reddit_request_label", default="other")
+        self.requests = Counter()
+        self.invocations = Counter()
+        self.budget = budget if budget is not None else RateLimitBudget("oauth")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._instance_locks = {}
+
+    @classmethod
+    def for_bot(cls, bot):
+        """Return the bot-wide client, creating it on first use.
+
+        Parameters:
+            bot: BrandoBot (class `BrandoBot`)
+                Instance of the BrandoBot client.
+
+        Returns:
+            client (class RedditClient): The client shared by every Reddit consumer.
+        """
+        client = getattr(bot, "reddit_client", None)
+        if client is None:
+            client = cls(
+                max_workers=settings.REDDIT_MAX_WORKERS,
+                budget=RateLimitRegistry.for_bot(bot).budget("reddit", "oauth"),
+            )
+            bot.reddit_client = client
+        return client
+
+    @property
+    def reddit(self):
+        """The calling worker thread's `praw.Reddit` instance."""
+        reddit = getattr(self._local, "reddit", None)
+        if reddit is None:
+            reddit = praw.Reddit(
+                client_id=settings.REDDIT_CLIENT_ID,
+                client_secret=settings.REDDIT_CLIENT_SECRET,
+                username=settings.REDDIT_USERNAME,
+                password=settings.REDDIT_PASSWORD,
+                user_agent=settings.REDDIT_USER_AGENT,
+                requestor_class=CountingRequestor,
+                requestor_kwargs={"on_request": self._count_request},
+            )
+            self._local.reddit = reddit
+            with self._lock:
+                self._instance_locks[reddit] = threading.Lock()
+        return reddit
+
+    def _count_request(self):
+        """Count a request against the worker's current label."""
+        with self._lock:
+            self.requests[getattr(self._local, "label", "other")] += 1
+
+    def track(self, label: str):
+        """Count subsequent requests in the current context against `label`.
+
+        Parameters:
+            label (str): Usually the invoked command's name.
+        """
+        self.label.set(label)
+        with self._lock:
+            self.invocations[label] += 1
+
+    def request_stats(self):
+        """Requests per label.
+
+        Returns:
+            stats (dict): Label to `(requests, invocations)`.
+        """
+        with self._lock:
+            return {
+                label: (count, self.invocations[label])
+                for label, count in self.requests.items()
+            }
+
+    async def run(self, func, *args, **kwargs):
+        """Run `func(reddit, *args, **kwargs)` on a Reddit worker thread.
+
+        Consume listings and lazy attributes inside `func`; objects returned
+        from it should be plain data or embeds, not lazy PRAW models.
+
+        Parameters:
+            func (callable): Blocking function taking a `praw.Reddit` first.
+            args (*): Positional arguments for `func`.
+            kwargs (**): Keyword arguments for `func`.
+
+        Returns:
+            result (any): The return value of `func`.
+        """
+        return await self._submit(None, func, *args, **kwargs)
+
+    async def run_on(self, reddit, func, *args, **kwargs):
+        """Run `func(reddit, *args, **kwargs)` against a specific `praw.Reddit`.
+
+        Use this to continue with lazy objects returned by an earlier `run`,
+        passing the `praw.Reddit` that call received.
+
+        Parameters:
+            reddit (class Reddit): The instance that created the objects in use.
+            func (callable): Blocking function taking a `praw.Reddit` first.
+
+        Returns:
+            result (any): The return value of `func`.
+        """
+        return await self._submit(reddit, func, *args, **kwargs)
+
+    async def _submit(self, reddit, func, *args, **kwargs):
+        """Hand `func` to the pool, holding the lock of the instance it uses."""
+        label = self.label.get()
+
+        limits = {}
+
+        def call():
+            self._local.label = label
+            instance = reddit if reddit is not None else self.reddit
+            with self._instance_locks[instance]:
+                try:
+                    return func(instance, *args, **kwargs)
+                finally:
+                    limits.update(instance.auth.limits)
+
+        try:
+            return await self.executor.run(call)
+        finally:
+            if limits.get("remaining") is not None:
+                self.budget.update(
+                    limits["remaining"] + (limits.get("used") or 0),
+                    limits["remaining"],
+                    limits.get("reset_timestamp"),
+                )
+
+    def close(self):
+        """Shut the worker pool down."""
+        self.executor.shutdown()
+
+
+class CommentWalker:
+    """Lazy, bounded depth-first walk of a comment forest.
+
+    Comments are yielded one at a time in thread order, so pages can be taken
+    with `page` without loading the whole forest. Each level only visits its
+    first `max_breadth` children, replies deeper than `max_depth` are skipped,
+    and at most `more_budget` `MoreComments` placeholders are expanded (each
+    expansion is one API request). Memory is bounded by the walk's stack of
+    `max_depth` levels.
+
+    Attributes:
+        max_depth (int): Deepest reply level visited, top-level comments are depth 0.
+        max_breadth (int): Children visited per comment (and at the top level).
+        more_budget (int): `MoreComments` expansions allowed.
+        expanded (int): `MoreComments` expansions made so far.
+        walked (int): Comments yielded so far.
+    """
+
+    def __init__(
+        self, forest, max_depth: int = 3, max_breadth: int = 10, more_budget: int = 5
+    ):
+        self.max_depth = max_depth
+        self.max_breadth = max_breadth
+        self.more_budget = more_budget
+        self.expanded = 0
+        self.walked = 0
+        self._stack = [(islice(forest, max_breadth), 0)]
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while self._stack:
+            children, depth = self._stack[-1]
+            x = next(children, None)
+            if x is None:
+                self._stack.pop()
+                continue
+            if isinstance(x, MoreComments):
+                if self.expanded < self.more_budget:
+                    self.expanded += 1
+                    self._stack.append((islice(x.comments(), self.max_breadth), depth))
+                continue
+            if depth + 1 < self.max_depth:
+                self._stack.append((islice(x.replies, self.max_breadth), depth + 1))
+            self.walked += 1
+            return x, depth
+        raise StopIteration
+
+    @property
+    def exhausted(self):
+        """`True` once every reachable comment has been walked."""
+        return not self._stack
+
+    def page(self, size: int):
+        """Walk the next `size` comments.
+
+        Returns:
+            page (list): `(comment, depth)` tuples.
+        """
+        return list(islice(self, size))
+
+
+class ListingCache:
+    """Subreddit listing cache with prefix reuse.
+
+    Listings are cached per subreddit, sort and timeframe. Each entry keeps the
+    deepest prefix fetched so far, so a `count=5` request is answered from a
+    cached `count=25` listing, and a deeper request only fetches the missing
+    tail, continuing from the cached `after` cursor.
+
+    Attributes:
+        client: RedditClient (class `RedditClient`)
+            Shared PRAW client used for fetching.
+        render (callable): Turns a list of `Submission` objects into `Embed` objects.
+        cache: TTLCache (class `TTLCache`)
+            Cached `Listing` entries.
+        flights: SingleFlight (class `SingleFlight`)
+            Coalesces identical concurrent fetches.
+    """
+
+    ttls = {
+        "new": 60,
+        "rising": 120,
+        "hot": 300,
+        "controversial": 900,
+        "top": {
+            "hour": 300,
+            "day": 900,
+            "week": 3600,
+            "month": 3 * 3600,
+            "year": 6 * 3600,
+            "all": 12 * 3600,
+        },
+    }
+
+    class Listing:
+        """A cached listing prefix.
+
+        Attributes:
+            posts (list): Rendered posts, in listing order.
+            after (str): Fullname of the last fetched submission, the next page cursor.
+            exhausted (bool): The subreddit has no more posts past `after`.
+        """
+
+        __slots__ = ("posts", "after", "exhausted")
+
+        def __init__(self, posts: list, after: str, exhausted: bool):
+            self.posts = posts
+            self.after = after
+            self.exhausted = exhausted
+
+        def covers(self, count: int):
+            return len(self.posts) >= count or self.exhausted
+
+    def __init__(self, client, render, maxsize: int = 128):
+        self.client = client
+        self.render = render
+        self.cache = TTLCache(maxsize=maxsize, stale_ttl=0)
+        self.flights = SingleFlight()
+
+    def ttl(self, sort: str, timeframe: str = None):
+        """Seconds a listing stays fresh for a sort and timeframe."""
+        ttl = ListingCache.ttls.get(sort, 300)
+        if isinstance(ttl, dict):
+            return ttl.get(timeframe, 300)
+        return ttl
+
+    async def posts(self, sub: str, sort: str, count: int, timeframe: str = None):
+        """Return the first `count` rendered posts of a listing.
+
+        Parameters:
+            sub (str): The subreddit name, without the 'r/'.
+            sort (str): "hot", "new", "rising", "top" or "controversial".
+            count (int): Number of posts wanted.
+            timeframe (str): Default `None`, time filter for "top" and "controversial".
+
+        Returns:
+            posts (list): Up to `count` rendered posts.
+        """
+        key = (sub.lower(), sort, timeframe)
+        entry = self.cache.get(key)
+        if entry is None or not entry.covers(count):
+
+            async def fetch():
+                extended = await self.client.run(self._extend, key, entry, count)
+                # Extending keeps the original expiry, the head is only refetched
+                # once the whole entry goes stale, even if that is now.
+                ttl = self.ttl(sort, timeframe)
+                if entry is not None:
+                    ttl = self.cache.ttl_remaining(key)
+                current = self.cache.peek(key)
+                if (
+                    current is None
+                    or current is entry
+                    or len(current.posts) < len(extended.posts)
+                ):
+                    self.cache.set(key, extended, ttl=ttl)
+                return extended
+
+            entry = await self.flights.do((key, count), fetch)
+        return entry.posts[:count]
+
+    def _extend(self, reddit, key: tuple, entry, count: int):
+        """Fetch the missing tail of a listing. Runs on a Reddit worker.
+
+        Returns:
+            listing (class Listing): `entry` extended to at least `count` posts.
+        """
+        sub, sort, timeframe = key
+        have = entry.posts if entry is not None else []
+        params = {"after": entry.after} if entry is not None and entry.after else {}
+        kwargs = {"limit": count - len(have), "params": params}
+        if sort in ("top", "controversial"):
+            kwargs["time_filter"] = timeframe
+        submissions = list(getattr(reddit.subreddit(sub), sort)(**kwargs))
+
+        return ListingCache.Listing(
+            have + self.render(submissions),
+            submissions[-1].fullname if submissions else params.get("after"),
+            len(submissions) < kwargs["limit"],
+        )
@@ -0,0 +1,246 @@
+import asyncio
+import time
+from collections import deque
+
+MESSAGE_LIMIT = 2000
+
+
+class RouteBucket:
+    """Token bucket pacing requests to one Discord rate-limit route.
+
+    The rate is fixed rather than read from Discord's `X-RateLimit-*` headers.
+    discord.py consumes those headers inside its HTTP client (sleeping on
+    exhausted buckets and retrying 429s) and never hands them back to callers,
+    so the bucket approximates the documented per-channel message limit.
+
+    Attributes:
+        rate (int): Requests allowed per window.
+        per (float): Window length in seconds.
+    """
+
+    def __init__(self, rate: int, per: float):
+        self.rate = rate
+        self.per = per
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+
+    def delay(self):
+        """Seconds until a request may be made on this route."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.rate, self._tokens + (now - self._updated) * self.rate / self.per
+        )
+        self._updated = now
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) * self.per / self.rate
+
+    @property
+    def full(self):
+        """`True` once the bucket has refilled completely."""
+        self.delay()
+        return self._tokens >= self.rate
+
+    async def acquire(self):
+        """Wait for a token and take it."""
+        delay = self.delay()
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = self.delay()
+        self._tokens -= 1
+
+
+class _Outgoing:
+    """A queued payload and the future resolved with its `Message`."""
+
+    __slots__ = ("content", "embed", "future", "queued_at")
+
+    def __init__(self, content, embed, future):
+        self.content = content
+        self.embed = embed
+        self.future = future
+        self.queued_at = time.monotonic()
+
+    @property
+    def mergeable(self):
+        return self.embed is None and self.content is not None
+
+
+class MessageScheduler:
+    """Central outbound message queue for channels and DMs.
+
+    Every destination gets its own queue, drained by a worker that exists only
+    while the queue is non-empty. Interactive replies are always sent before
+    queued bulk output (stream and feed deliveries). Adjacent text-only
+    payloads are merged into a single message up to Discord's 2,000 character
+    limit, and sends are paced with per-destination and global token buckets
+    that approximate Discord's message rate limits, so bursts queue locally
+    (where interactive replies can overtake them) instead of piling up in
+    discord.py's own rate-limit handling.
+
+    The buckets use fixed rates: discord.py reads the real per-route buckets
+    from the `X-RateLimit-*` response headers internally and does not expose
+    them, so they cannot be learned here. discord.py still enforces the real
+    limits underneath, the defaults only need to stay at or below them.
+
+    Attributes:
+        route_rate (int): Messages per `route_per` seconds allowed per destination.
+        route_per (float): Per-destination window in seconds.
+        global_bucket (class RouteBucket): Bot-wide request pacing.
+        sent (int): Messages sent.
+        merged (int): Payloads merged into a previous message.
+        failed (int): Messages Discord rejected.
+    """
+
+    def __init__(
+        self,
+        route_rate: int = 5,
+        route_per: float = 5.0,
+        global_rate: int = 50,
+        global_per: float = 1.0,
+    ):
+        self.route_rate = route_rate
+        self.route_per = route_per
+        self.global_bucket = RouteBucket(global_rate, global_per)
+        self.sent = 0
+        self.merged = 0
+        self.failed = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._latency_count = 0
+        self._queues = {}
+        self._buckets = {}
+        self._workers = {}
+
+    def enqueue(self, destination, content: str = None, embed=None, bulk=False):
+        """Queue a message without waiting for it to be sent.
+
+        Await the returned future (or use `send`) to surface send errors.
+
+        Parameters:
+            destination (class Messageable): Channel, user or member to send to.
+            content (str): Default `None`, the message text.
+            embed (class Embed): Default `None`, the message embed.
+            bulk (bool): Default `False`, queue behind interactive replies.
+
+        Returns:
+            future (class Future): Resolved with the `Message` carrying the payload.
+        """
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        key = destination.id
+        interactive, background = self._queues.setdefault(key, (deque(), deque()))
+        (background if bulk else interactive).append(
+            _Outgoing(content, embed, future)
+        )
+        if key not in self._workers:
+            self._workers[key] = loop.create_task(self._drain(key, destination))
+        if len(self._buckets) > 1024:
+            self._prune_buckets()
+        return future
+
+    async def send(self, destination, content: str = None, embed=None, bulk=False):
+        """Queue a message and wait until it is sent.
+
+        Returns:
+            message (class Message): The message carrying the payload.
+        """
+        return await self.enqueue(destination, content, embed=embed, bulk=bulk)
+
+    def _take(self, key):
+        """Pop the next payloads to send as one message, merging small text."""
+        interactive, background = self._queues[key]
+        queue = interactive or background
+        batch = [queue.popleft()]
+        if batch[0].mergeable:
+            length = len(batch[0].content)
+            while queue and queue[0].mergeable:
+                extra = len(queue[0].content) + 1
+                if length + extra > MESSAGE_LIMIT:
+                    break
+                length += extra
+                batch.append(queue.popleft())
+        return batch
+
+    async def _drain(self, key, destination):
+        """Send everything queued for a destination, then exit."""
+        bucket = self._buckets.setdefault(
+            key, RouteBucket(self.route_rate, self.route_per)
+        )
+        try:
+            while any(self._queues[key]):
+                batch = self._take(key)
+                if len(batch) > 1:
+                    content = "\n".join(x.content.rstrip("\n") for x in batch)
+                    self.merged += len(batch) - 1
+                else:
+                    content = batch[0].content
+                await bucket.acquire()
+                await self.global_bucket.acquire()
+                try:
+                    message = await destination.send(content, embed=batch[0].embed)
+                except Exception as exc:
+                    self.failed += 1
+                    for x in batch:
+                        if not x.future.done():
+                            x.future.set_exception(exc)
+                    continue
+                self.sent += 1
+                now = time.monotonic()
+                for x in batch:
+                    self._record_latency(now - x.queued_at)
+                    if not x.future.done():
+                        x.future.set_result(message)
+        finally:
+            self._workers.pop(key, None)
+            if not any(self._queues.get(key, ())):
+                self._queues.pop(key, None)
+
+    def _prune_buckets(self):
+        """Forget buckets of idle destinations that have fully refilled."""
+        idle = [
+            key
+            for key, bucket in self._buckets.items()
+            if key not in self._workers and bucket.full
+        ]
+        for key in idle:
+            del self._buckets[key]
+
+    def _record_latency(self, latency):
+        self._latency_total += latency
+        self._latency_count += 1
+        self._latency_max = max(self._latency_max, latency)
+
+    def depth(self):
+        """Queued payloads per destination.
+
+        Returns:
+            depth (dict): Destination ID to `(interactive, bulk)` queue lengths.
+        """
+        return {
+            key: (len(interactive), len(background))
+            for key, (interactive, background) in self._queues.items()
+        }
+
+    def stats(self):
+        """Queue and latency metrics.
+
+        Returns:
+            stats (dict): Queue depth, active destinations, sent, merged, failed and
+                        average / max send latency in milliseconds.
+        """
+        depth = self.depth()
+        return {
+            "queued_interactive": sum(x for x, _ in depth.values()),
+            "queued_bulk": sum(x for _, x in depth.values()),
+            "destinations": len(depth),
+            "sent": self.sent,
+            "merged": self.merged,
+            "failed": self.failed,
+            "avg_latency_ms": round(
+                1000 * self._latency_total / self._latency_count, 1
+            )
+            if self._latency_count
+            else 0.0,
+            "max_latency_ms": round(1000 * self._latency_max, 1),
+        }
@@ -0,0 +1,46 @@
+import asyncio
+
+
+class SingleFlight:
+    """Coalesce identical concurrent upstream fetches.
+
+    The first caller for a key starts the fetch, every caller that arrives
+    while it is still running awaits the same result instead of issuing its
+    own request. Once the fetch finishes the key is forgotten, so the next
+    caller fetches fresh data.
+
+    Attributes:
+        calls (int): Number of fetches actually started.
+        coalesced (int): Number of callers that joined an in-flight fetch.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._flights = {}
+
+    def __len__(self):
+        return len(self._flights)
+
+    async def do(self, key, fetch):
+        """Run `fetch` once for all concurrent callers of `key`.
+
+        The shared fetch is shielded, so a caller being cancelled (e.g. a command
+        timing out) does not cancel the fetch for everybody else.
+
+        Parameters:
+            key (hashable): Identifies identical requests.
+            fetch (coroutine function): Called with no arguments to produce the result.
+
+        Returns:
+            result (any): The result of the shared fetch.
+        """
+        future = self._flights.get(key)
+        if future is None:
+            self.calls += 1
+            future = asyncio.ensure_future(fetch())
+            self._flights[key] = future
+            future.add_done_callback(lambda _: self._flights.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(future)
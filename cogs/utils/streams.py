@@ -0,0 +1,494 @@
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime
+
+import discord
+
+from cogs.utils.matcher import PhraseMatcher
+
+log = logging.getLogger(__name__)
+
+
+class BoundedSet:
+    """Set that forgets its oldest members past `maxlen`.
+
+    Used to remember recently delivered IDs without growing forever.
+
+    Attributes:
+        maxlen (int): Maximum number of members kept.
+    """
+
+    def __init__(self, maxlen: int = 1000):
+        self.maxlen = maxlen
+        self._order = deque()
+        self._items = set()
+
+    def __contains__(self, item):
+        return item in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._order)
+
+    def add(self, item):
+        """Add `item`, dropping the oldest member if the set is full."""
+        if item in self._items:
+            return
+        self._order.append(item)
+        self._items.add(item)
+        if len(self._order) > self.maxlen:
+            self._items.discard(self._order.popleft())
+
+
+class SubredditStreamManager:
+    """Shared subreddit streams with fan-out to subscribers.
+
+    Keeps exactly one background poller per subreddit no matter how many users
+    subscribe to it. Each poller reads the subreddit's newest submissions on
+    the Reddit worker pool, drops anything already seen and DMs every new
+    submission to the matching subscribers. Upstream calls and memory scale with
+    the number of distinct subreddits, not the number of subscribers.
+
+    Watch phrases for a subreddit are compiled into one `PhraseMatcher`, so each
+    title and body is scanned once for every subscriber's phrases.
+
+    Attributes:
+        bot: BrandoBot (class `BrandoBot`)
+            Instance of the BrandoBot client.
+        client: RedditClient (class `RedditClient`)
+            Shared PRAW client used for polling.
+        render (callable): Turns a list of `Submission` objects into `Embed` objects.
+        interval (float): Seconds between polls of a subreddit.
+        seen_size (int): Submission IDs remembered per subreddit.
+        subscribers (dict): Subreddit name to `{user_id: phrases}` subscriptions,
+                            an empty set of phrases receives every submission.
+        watchers (dict): Subreddit name to the `PhraseMatcher` of its phrases.
+    """
+
+    def __init__(
+        self, bot, client, render, interval: float = 30.0, seen_size: int = 1000
+    ):
+        self.bot = bot
+        self.client = client
+        self.render = render
+        self.interval = interval
+        self.seen_size = seen_size
+        self.subscribers = {}
+        self.watchers = {}
+        self._tasks = {}
+
+    def subscribe(self, sub: str, user_id: int, phrase: str = None):
+        """Subscribe a user to a subreddit, starting its stream if needed.
+
+        Subscribing with a phrase adds it to the user's watch phrases for the
+        subreddit, subscribing without one delivers every submission.
+
+        Parameters:
+            sub (str): The subreddit name, without the 'r/'.
+            user_id (int): Discord user ID to DM.
+            phrase (str): Default `None`, only deliver posts containing this phrase.
+        """
+        sub = sub.lower()
+        phrases = self.subscribers.setdefault(sub, {}).setdefault(user_id, set())
+        watcher = self.watchers.setdefault(sub, PhraseMatcher())
+        if phrase:
+            phrases.add(phrase.casefold())
+            watcher.add(phrase, user_id)
+        else:
+            for x in phrases:
+                watcher.remove(x, user_id)
+            phrases.clear()
+        if sub not in self._tasks:
+            self._tasks[sub] = self.bot.loop.create_task(self._stream(sub))
+
+    def unsubscribe(self, sub: str, user_id: int, phrase: str = None):
+        """Unsubscribe a user, stopping the stream once nobody is left.
+
+        Parameters:
+            sub (str): The subreddit name, without the 'r/'.
+            user_id (int): Discord user ID.
+            phrase (str): Default `None` removes the whole subscription, otherwise
+                        only this watch phrase.
+
+        Returns:
+            removed (bool): `True` if the user was subscribed.
+        """
+        sub = sub.lower()
+        subscribers = self.subscribers.get(sub, {})
+        phrases = subscribers.get(user_id)
+        if phrases is None:
+            return False
+        watcher = self.watchers[sub]
+        if phrase:
+            if phrase.casefold() not in phrases:
+                return False
+            phrases.discard(phrase.casefold())
+            watcher.remove(phrase, user_id)
+        if not phrase or not phrases:
+            for x in phrases:
+                watcher.remove(x, user_id)
+            del subscribers[user_id]
+        if not subscribers:
+            self.subscribers.pop(sub, None)
+            self.watchers.pop(sub, None)
+            task = self._tasks.pop(sub, None)
+            if task is not None:
+                task.cancel()
+        return True
+
+    def subscriptions(self, user_id: int):
+        """Subreddits a user is subscribed to.
+
+        Returns:
+            subs (dict): Subreddit name to the user's set of phrases.
+        """
+        return {
+            sub: users[user_id]
+            for sub, users in self.subscribers.items()
+            if user_id in users
+        }
+
+    def close(self):
+        """Cancel every stream."""
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+
+    async def _stream(self, sub: str):
+        """Poll a subreddit until it has no subscribers left."""
+        self.client.label.set(f"stream:{sub}")
+        seen = BoundedSet(self.seen_size)
+        primed = False
+        while sub in self.subscribers:
+            try:
+                posts = await self.client.run(self._poll, sub, set(seen), primed)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.exception("Polling r/%s failed", sub)
+            else:
+                for post_id, _, _ in posts:
+                    seen.add(post_id)
+                # The first poll only records what already exists, like `skip_existing`.
+                if primed:
+                    await self._fan_out(sub, posts)
+                primed = True
+            await asyncio.sleep(self.interval)
+
+    def _poll(self, reddit, sub: str, seen: set, render: bool):
+        """Fetch unseen submissions, oldest first. Runs on a Reddit worker.
+
+        Returns:
+            posts (list): `(id, text, embed)` tuples for unseen submissions, `text`
+                        is the title and body, `embed` is `None` when `render` is `False`.
+        """
+        submissions = [
+            x for x in reddit.subreddit(sub).new(limit=100) if x.id not in seen
+        ]
+        submissions.reverse()
+        embeds = self.render(submissions) if render else [None] * len(submissions)
+        return [
+            (x.id, f"{x.title}\n{x.selftext}", e) for x, e in zip(submissions, embeds)
+        ]
+
+    async def _fan_out(self, sub: str, posts: list):
+        """DM each new submission to every subscriber whose phrases match.
+
+        Deliveries are queued as bulk output on the bot's outbox, behind
+        interactive command replies.
+        """
+        for _, text, embed in posts:
+            subscribers = self.subscribers.get(sub, {})
+            watcher = self.watchers.get(sub)
+            recipients = {x for x, phrases in subscribers.items() if not phrases}
+            if watcher is not None:
+                recipients |= watcher.match(text)
+            deliveries = {}
+            for user_id in recipients:
+                user = self.bot.get_user(user_id)
+                try:
+                    if user is None:
+                        user = await self.bot.fetch_user(user_id)
+                except discord.HTTPException:
+                    log.warning("Could not find user %s for r/%s", user_id, sub)
+                    continue
+                deliveries[user_id] = self.bot.outbox.enqueue(
+                    user, embed=embed, bulk=True
+                )
+            results = await asyncio.gather(
+                *deliveries.values(), return_exceptions=True
+            )
+            for user_id, result in zip(deliveries, results):
+                if isinstance(result, Exception):
+                    log.warning("Could not DM r/%s submission to %s", sub, user_id)
+
+
+class TimelineFeedManager:
+    """Shared Twitter timeline feeds with fan-out to channels.
+
+    Keeps exactly one background poller per list or user timeline, however
+    many channels follow it. Each poller holds the timeline's `since_id`
+    cursor, so every poll only fetches tweets posted since the last one, and
+    queues each new tweet once to every subscribed channel before the cursor
+    moves on. Channels that subscribe later start from the shared cursor, so
+    upstream calls scale with the number of distinct timelines, not channels.
+
+    The poll interval adapts to the timeline: it halves (down to
+    `min_interval`) after a poll that found tweets and grows by half (up to
+    `max_interval`) after one that did not. It is also never shorter than the
+    endpoint's remaining rate budget allows, shared between every feed polling
+    that endpoint.
+
+    Attributes:
+        bot: BrandoBot (class `BrandoBot`)
+            Instance of the BrandoBot client.
+        client: TwitterClient (class `TwitterClient`)
+            Client the timeline calls run on.
+        render (callable): Turns a list of `Status` objects into `Embed` objects.
+        min_interval (float): Shortest time between polls of a timeline.
+        max_interval (float): Longest time between polls of a timeline.
+        seen_size (int): Tweet IDs remembered per timeline.
+        max_pages (int): Most pages fetched by one poll to catch up.
+        subscribers (dict): Timeline key to the set of subscribed channel IDs.
+        intervals (dict): Timeline key to its current poll interval.
+    """
+
+    def __init__(
+        self,
+        bot,
+        client,
+        render,
+        min_interval: float = 60.0,
+        max_interval: float = 900.0,
+        seen_size: int = 1000,
+        max_pages: int = 4,
+        page_size: int = 200,
+    ):
+        self.bot = bot
+        self.client = client
+        self.render = render
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.seen_size = seen_size
+        self.max_pages = max_pages
+        self.page_size = page_size
+        self.subscribers = {}
+        self.intervals = {}
+        self._timelines = {}
+        self._tasks = {}
+
+    def subscribe(
+        self,
+        key: tuple,
+        endpoint: str,
+        timeline,
+        channel_id: int,
+        app_only: bool = False,
+    ):
+        """Subscribe a channel to a timeline, starting its feed if needed.
+
+        Parameters:
+            key (tuple): Identifies the timeline, e.g. `("list", slug, include_rts)`.
+            endpoint (str): The timeline endpoint, e.g. "lists/statuses".
+            timeline (callable): Performs the Tweepy timeline call given a
+                                `tweepy.API`, `count`, `since_id` and `max_id`
+                                keywords.
+            channel_id (int): Discord channel ID to post to.
+            app_only (bool): Default `False`, poll a public timeline with
+                            `TwitterClient.read`.
+
+        Returns:
+            added (bool): `False` if the channel was already subscribed.
+        """
+        channels = self.subscribers.setdefault(key, set())
+        if channel_id in channels:
+            return False
+        channels.add(channel_id)
+        self._timelines[key] = (endpoint, timeline, app_only)
+        if key not in self._tasks:
+            self.intervals[key] = self.min_interval
+            self._tasks[key] = self.bot.loop.create_task(self._feed(key))
+        return True
+
+    def unsubscribe(self, key: tuple, channel_id: int):
+        """Unsubscribe a channel, stopping the feed once nobody is left.
+
+        Returns:
+            removed (bool): `True` if the channel was subscribed.
+        """
+        channels = self.subscribers.get(key)
+        if not channels or channel_id not in channels:
+            return False
+        channels.discard(channel_id)
+        if not channels:
+            del self.subscribers[key]
+            self._timelines.pop(key, None)
+            self.intervals.pop(key, None)
+            task = self._tasks.pop(key, None)
+            if task is not None:
+                task.cancel()
+        return True
+
+    def subscriptions(self, channel_id: int):
+        """Timelines a channel is subscribed to.
+
+        Returns:
+            feeds (dict): Timeline key to its current poll interval.
+        """
+        return {
+            key: self.intervals.get(key)
+            for key, channels in self.subscribers.items()
+            if channel_id in channels
+        }
+
+    def close(self):
+        """Cancel every feed."""
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+
+    def _budget_interval(self, endpoint: str, app_only: bool):
+        """Shortest interval the endpoint's remaining budget can sustain."""
+        if app_only:
+            budgets = self.client.read_budgets(endpoint)
+        else:
+            budgets = [self.client.budget(endpoint)]
+        snapshots = [x.snapshot() for x in budgets]
+        if any(x["remaining"] is None or x["reset_in"] is None for x in snapshots):
+            return 0.0
+        remaining = sum(x["remaining"] for x in snapshots)
+        reset_in = max(x["reset_in"] for x in snapshots)
+        feeds = sum(
+            1
+            for x, _, y in self._timelines.values()
+            if x == endpoint and y == app_only
+        )
+        # A request per feed is left for commands reading the same endpoint.
+        spare = max(remaining - feeds, 1)
+        return reset_in / spare * feeds
+
+    async def _feed(self, key: tuple):
+        """Poll a timeline until it has no subscribers left."""
+        seen = BoundedSet(self.seen_size)
+        since_id = None
+        while key in self.subscribers:
+            endpoint, _, app_only = self._timelines[key]
+            interval = self.intervals[key]
+            try:
+                if since_id is None:
+                    # The first poll only records where the timeline is.
+                    since_id = await self._prime(key)
+                    tweets = None
+                else:
+                    tweets = await self._poll(key, since_id, set(seen))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                log.exception("Polling Twitter timeline %s failed", key)
+            else:
+                if tweets:
+                    await self._fan_out(key, tweets)
+                    interval /= 2
+                    since_id = tweets[-1][0]
+                    for tweet_id, _ in tweets:
+                        seen.add(tweet_id)
+                elif tweets is not None:
+                    interval *= 1.5
+            interval = min(max(interval, self.min_interval), self.max_interval)
+            self.intervals[key] = interval
+            budget_interval = self._budget_interval(endpoint, app_only)
+            await asyncio.sleep(max(interval, budget_interval))
+
+    async def _prime(self, key: tuple):
+        """The cursor a new feed starts from, the newest tweet's ID.
+
+        A full-size page is requested, `count` is applied before deleted tweets
+        and filtered retweets are dropped, so a smaller request can come back
+        empty while the timeline is not. If it is empty the cursor is the ID a
+        tweet posted now would have, so nothing older is ever delivered.
+        """
+        # Imported here, `expiry` loads tweepy and the Reddit cog uses this module.
+        from cogs.utils.expiry import snowflake_at
+
+        endpoint, timeline, app_only = self._timelines[key]
+        call = self.client.read if app_only else self.client.run
+        page = await call(
+            endpoint, lambda api: [x.id for x in timeline(api, count=self.page_size)]
+        )
+        return max(page, default=snowflake_at(datetime.utcnow()))
+
+    async def _poll(self, key: tuple, since_id: int, seen: set):
+        """Fetch tweets newer than `since_id`, oldest first.
+
+        Polls page back with `max_id` until they meet the cursor, at most
+        `max_pages` pages. Short pages are routine (deleted tweets and filtered
+        retweets count against `count`), so only a page holding the cursor
+        tweet itself, or an empty page, ends the catch-up.
+
+        Returns:
+            tweets (list): `(status_id, embed)` tuples of unseen tweets.
+        """
+        endpoint, timeline, app_only = self._timelines[key]
+        call = self.client.read if app_only else self.client.run
+        tweets = []
+        max_id = None
+        for _ in range(self.max_pages):
+            page, oldest, reached = await call(
+                endpoint, self._fetch, timeline, since_id, max_id, seen
+            )
+            tweets.extend(page)
+            if reached:
+                break
+            max_id = oldest - 1
+        else:
+            log.warning("Twitter timeline %s is %s+ tweets behind", key, len(tweets))
+        tweets.reverse()
+        return tweets
+
+    def _fetch(self, api, timeline, since_id: int, max_id: int, seen):
+        """Fetch and render a page of unseen tweets. Runs on a Twitter worker.
+
+        The cursor tweet itself is requested too, seeing it shows the page
+        reached the cursor.
+
+        Returns:
+            result (tuple): `(status_id, embed)` tuples newer than `since_id`,
+                            newest first, the oldest status ID of the page and
+                            whether the page reached the cursor.
+        """
+        page = timeline(
+            api, count=self.page_size, since_id=since_id - 1, max_id=max_id
+        )
+        oldest = min((x.id for x in page), default=None)
+        reached = oldest is None or oldest <= since_id
+        page = [x for x in page if x.id > since_id and x.id not in seen]
+        return list(zip((x.id for x in page), self.render(page))), oldest, reached
+
+    async def _fan_out(self, key: tuple, tweets: list):
+        """Post each new tweet once to every subscribed channel.
+
+        Deliveries are queued as bulk output on the bot's outbox, behind
+        interactive command replies. A failed delivery is logged rather than
+        retried, so a tweet is never posted twice to a channel.
+        """
+        for tweet_id, embed in tweets:
+            deliveries = {}
+            for channel_id in self.subscribers.get(key, ()):
+                channel = self.bot.get_channel(channel_id)
+                if channel is None:
+                    log.warning("Could not find channel %s for %s", channel_id, key)
+                    continue
+                deliveries[channel_id] = self.bot.outbox.enqueue(
+                    channel, embed=embed, bulk=True
+                )
+            results = await asyncio.gather(
+                *deliveries.values(), return_exceptions=True
+            )
+            for channel_id, result in zip(deliveries, results):
+                if isinstance(result, Exception):
+                    log.warning(
+                        "Could not post tweet %s to channel %s", tweet_id, channel_id
+                    )
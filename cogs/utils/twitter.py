@@ -0,0 +1,543 @@
+import asyncio
+import threading
+from datetime import datetime
+
+import tweepy
+
+import settings
+from cogs.utils.cache import TTLCache
+from cogs.utils.executor import BlockingExecutor
+from cogs.utils.ratelimit import RateLimitBudget, RateLimited
+from cogs.utils.singleflight import SingleFlight
+
+# Users per users/lookup and lists/members/*_all request.
+USERS_PER_CALL = 100
+# "No user matches for specified terms."
+NO_USER_MATCHES = 17
+# Most statuses a timeline request returns.
+STATUSES_PER_CALL = 200
+# HTTP status of a read app-only credentials may not make, e.g. protected tweets.
+UNAUTHORIZED = 401
+
+
+class BearerAuth:
+    """App-only credentials from an issued bearer token.
+
+    Tweepy's `AppAuthHandler` requests a new token when it is built, this uses
+    the token from the settings as is.
+
+    Attributes:
+        bearer_token (str): The app's bearer token.
+    """
+
+    def __init__(self, bearer_token: str):
+        self.bearer_token = bearer_token
+
+    def apply_auth(self):
+        return tweepy.auth.OAuth2Bearer(self.bearer_token)
+
+
+class TwitterClient:
+    """Rate-aware, shareable Tweepy client.
+
+    Tweepy is synchronous, so every call runs on a dedicated bounded worker
+    pool. Each worker thread has its own `tweepy.API`, which keeps
+    `last_response` (and the `x-rate-limit-*` headers read from it) private to
+    the call that made it.
+
+    Calls name the endpoint they hit. Each endpoint has a `RateLimitBudget`
+    learned from its response headers: a call waits for the window to reset
+    when the budget is spent, or is rejected with `RateLimited` if that would
+    take longer than `max_wait`. Endpoints have separate budgets, so calls to
+    independent endpoints proceed in parallel.
+
+    Reads of public data can go through `read`, which uses a pool of app-only
+    credentials instead of the user context. Each credential has its own rate
+    windows, and every read uses the one with the most requests left, so the
+    pool adds up their capacity. Writes and reads of private data stay on the
+    user context with `run`.
+
+    Attributes:
+        auth: OAuthHandler (class `OAuthHandler`)
+            User-context credentials shared by every worker's `tweepy.API`.
+        app_auths (list): `BearerAuth` credentials used by `read`, may be empty.
+        executor: BlockingExecutor (class `BlockingExecutor`)
+            Worker pool all Twitter calls run on.
+        budgets (dict): Endpoint name to its `RateLimitBudget`, usually the
+                        "twitter" budgets of the bot's `RateLimitRegistry`.
+        app_budgets (list): Endpoint budgets of each of `app_auths`, in order.
+        max_wait (float): Longest wait for a budget reset before rejecting a call.
+    """
+
+    def __init__(
+        self,
+        auth,
+        max_workers: int = 4,
+        max_wait: float = 30.0,
+        budgets: dict = None,
+        app_auths: list = None,
+        app_budgets: list = None,
+    ):
+        self.auth = auth
+        self.executor = BlockingExecutor(max_workers=max_workers, name="twitter")
+        self.budgets = budgets if budgets is not None else {}
+        self.app_auths = app_auths or []
+        self.app_budgets = app_budgets or [{} for _ in self.app_auths]
+        self.max_wait = max_wait
+        self._local = threading.local()
+
+    @classmethod
+    def from_settings(cls, budgets: dict = None, app_budgets: list = None):
+        """Build a client from the Twitter settings.
+
+        The user context comes from the API key and access token, the app-only
+        pool from `TWITTER_BEARER_TOKENS`.
+
+        Parameters:
+            budgets (dict): Default `None`, user-context endpoint budgets.
+            app_budgets (list): Default `None`, endpoint budgets of each bearer
+                                token, in order.
+        """
+        auth = tweepy.OAuthHandler(
+            settings.TWITTER_API_KEY, settings.TWITTER_API_SECRET_KEY
+        )
+        auth.set_access_token(
+            settings.TWITTER_ACCESS_TOKEN, settings.TWITTER_ACCESS_TOKEN_SECRET
+        )
+        return cls(
+            auth,
+            max_workers=settings.TWITTER_MAX_WORKERS,
+            max_wait=settings.TWITTER_RATE_LIMIT_MAX_WAIT,
+            budgets=budgets,
+            app_auths=[BearerAuth(x) for x in settings.TWITTER_BEARER_TOKENS],
+            app_budgets=app_budgets,
+        )
+
+    @property
+    def api(self):
+        """The calling worker thread's user-context `tweepy.API` instance."""
+        return self._api(self.auth)
+
+    def _api(self, auth):
+        """The calling worker thread's `tweepy.API` instance for `auth`."""
+        apis = getattr(self._local, "apis", None)
+        if apis is None:
+            apis = self._local.apis = {}
+        api = apis.get(id(auth))
+        if api is None:
+            api = apis[id(auth)] = tweepy.API(auth)
+        return api
+
+    @staticmethod
+    def _budget(budgets: dict, endpoint: str):
+        budget = budgets.get(endpoint)
+        if budget is None:
+            budget = budgets[endpoint] = RateLimitBudget(endpoint)
+        return budget
+
+    def budget(self, endpoint: str):
+        """The user-context budget of an endpoint, created on first use."""
+        return self._budget(self.budgets, endpoint)
+
+    def read_budgets(self, endpoint: str):
+        """Budgets `read` spreads calls to an endpoint over.
+
+        Returns:
+            budgets (list): One `RateLimitBudget` per app credential, or the
+                            user-context budget when there are none.
+        """
+        if not self.app_auths:
+            return [self.budget(endpoint)]
+        return [self._budget(x, endpoint) for x in self.app_budgets]
+
+    def _app_credential(self, endpoint: str):
+        """The app credential and budget best placed to call `endpoint`.
+
+        Credentials that may call now are preferred, then the one with the most
+        requests left. An unknown budget counts as full.
+        """
+
+        def rank(pair):
+            budget = pair[1]
+            remaining = budget.remaining
+            return budget.delay(), -(remaining if remaining is not None else 1e9)
+
+        return min(zip(self.app_auths, self.read_budgets(endpoint)), key=rank)
+
+    async def run(self, endpoint: str, func, *args, **kwargs):
+        """Run `func(api, *args, **kwargs)` on a Twitter worker thread.
+
+        `func` should make a single request to `endpoint`, the budget is
+        updated from the headers of the last response it received.
+
+        Parameters:
+            endpoint (str): The endpoint hit, e.g. "lists/statuses".
+            func (callable): Blocking function taking a `tweepy.API` first.
+            args (*): Positional arguments for `func`.
+            kwargs (**): Keyword arguments for `func`.
+
+        Returns:
+            result (any): The return value of `func`.
+
+        Raises:
+            RateLimited: The endpoint's budget does not reset within `max_wait`.
+        """
+        return await self._call(self.auth, self.budget(endpoint), func, args, kwargs)
+
+    async def read(self, endpoint: str, func, *args, **kwargs):
+        """Like `run`, with app-only credentials when there are any.
+
+        Only for endpoints that read public data, app-only credentials cannot
+        write anything. A read they are not authorized for, such as a protected
+        account the user follows, is retried with the user context.
+
+        Raises:
+            RateLimited: No credential's budget resets within `max_wait`.
+        """
+        if not self.app_auths:
+            return await self.run(endpoint, func, *args, **kwargs)
+        auth, budget = self._app_credential(endpoint)
+        try:
+            return await self._call(auth, budget, func, args, kwargs)
+        except tweepy.TweepError as exc:
+            if getattr(exc.response, "status_code", None) != UNAUTHORIZED:
+                raise
+        return await self.run(endpoint, func, *args, **kwargs)
+
+    async def _call(self, auth, budget, func, args, kwargs):
+        await budget.acquire(self.max_wait)
+
+        def call():
+            api = self._api(auth)
+            api.last_response = None
+            try:
+                result, error = func(api, *args, **kwargs), None
+            except tweepy.TweepError as exc:
+                result, error = None, exc
+            response = api.last_response
+            if response is None:
+                response = getattr(error, "response", None)
+            return result, error, getattr(response, "headers", None)
+
+        result, error, headers = await self.executor.run(call)
+        budget.update_from_headers(headers)
+        if isinstance(error, tweepy.RateLimitError):
+            budget.exhaust()
+        if error is not None:
+            raise error
+        return result
+
+    async def change_list_members(
+        self,
+        slug: str,
+        owner_screen_name: str,
+        screen_names,
+        add: bool = True,
+        concurrency: int = 2,
+    ):
+        """Add or remove many users from a list with the bulk endpoints.
+
+        Screen names are sent 100 per request, chunks run `concurrency` at a
+        time. The bulk endpoints silently skip unknown users, so each chunk is
+        first resolved with one users/lookup request to report them.
+
+        Parameters:
+            slug (str): Slug of the `List` object.
+            owner_screen_name (str): The list owner.
+            screen_names (iterable): Screen names, with or without the `@`.
+            add (bool): Default `True` adds the users, `False` removes them.
+            concurrency (int): Default 2, chunks in flight at once.
+
+        Returns:
+            results (dict): Screen name to "added", "removed", "not found" or the
+                            reason its chunk failed, in input order.
+        """
+        names = list(dict.fromkeys(x.lstrip("@") for x in screen_names if x))
+        done = "added" if add else "removed"
+        endpoint = "lists/members/create_all" if add else "lists/members/destroy_all"
+        semaphore = asyncio.Semaphore(concurrency)
+        results = {}
+
+        def change(api, chunk):
+            method = api.add_list_members if add else api.remove_list_members
+            return method(
+                screen_name=chunk, slug=slug, owner_screen_name=owner_screen_name
+            )
+
+        async def apply(chunk):
+            async with semaphore:
+                try:
+                    found = await self.read(
+                        "users/lookup", lambda api: api.lookup_users(screen_names=chunk)
+                    )
+                except tweepy.TweepError as exc:
+                    if getattr(exc, "api_code", None) != NO_USER_MATCHES:
+                        results.update((x, f"failed ({exc})") for x in chunk)
+                        return
+                    found = []
+                except RateLimited as exc:
+                    results.update((x, f"failed ({exc})") for x in chunk)
+                    return
+                existing = {x.screen_name.casefold() for x in found}
+                valid = [x for x in chunk if x.casefold() in existing]
+                results.update((x, "not found") for x in chunk if x not in valid)
+                if not valid:
+                    return
+                try:
+                    await self.run(endpoint, change, valid)
+                except (tweepy.TweepError, RateLimited) as exc:
+                    results.update((x, f"failed ({exc})") for x in valid)
+                else:
+                    results.update((x, done) for x in valid)
+
+        await asyncio.gather(
+            *(
+                apply(names[i : i + USERS_PER_CALL])
+                for i in range(0, len(names), USERS_PER_CALL)
+            )
+        )
+        return {x: results[x] for x in names}
+
+    async def paged_timeline(
+        self,
+        endpoint: str,
+        timeline,
+        render,
+        count: int,
+        until: datetime = None,
+        page_size: int = STATUSES_PER_CALL,
+        app_only: bool = False,
+    ):
+        """Stream a timeline deeper than one request, newest first.
+
+        Pages are walked with `max_id` and rendered on the worker as they
+        arrive. While one page is consumed the next is already being fetched, and
+        no more than two pages are held at once. Paging stops as soon as
+        `count` statuses are yielded, a status older than `until` is reached or
+        the timeline runs out.
+
+        Parameters:
+            endpoint (str): The timeline endpoint, e.g. "statuses/user_timeline".
+            timeline (callable): Performs the Tweepy timeline call given a
+                                `tweepy.API`, `count` and `max_id` keywords.
+            render (callable): Turns a list of `Status` objects into `Embed` objects.
+            count (int): Most statuses to yield.
+            until (datetime): Default `None`, naive UTC datetime of the oldest
+                            status to yield.
+            page_size (int): Default 200, statuses per request.
+            app_only (bool): Default `False`, page a public timeline with `read`.
+
+        Yields:
+            embed (class Embed): A rendered status.
+        """
+
+        def fetch(api, max_id, wanted):
+            page = timeline(api, count=wanted, max_id=max_id)
+            oldest = min((x.id for x in page), default=None)
+            kept = [x for x in page if until is None or x.created_at >= until]
+            # Pages may come back short, only an empty page ends the timeline.
+            return render(kept), oldest, oldest is None or len(kept) < len(page)
+
+        call = self.read if app_only else self.run
+
+        def request(max_id, remaining):
+            wanted = min(page_size, remaining)
+            return asyncio.ensure_future(call(endpoint, fetch, max_id, wanted))
+
+        remaining = count
+        next_page = request(None, remaining) if remaining > 0 else None
+        try:
+            while next_page is not None:
+                embeds, oldest, last = await next_page
+                remaining -= len(embeds)
+                next_page = None
+                # The next page is fetched while this one is consumed.
+                if not last and remaining > 0:
+                    next_page = request(oldest - 1, remaining)
+                for embed in embeds:
+                    yield embed
+        finally:
+            if next_page is not None and not next_page.done():
+                next_page.cancel()
+
+    def close(self):
+        """Shut the worker pool down."""
+        self.executor.shutdown()
+
+
+class TimelineCache:
+    """Recent list and user timelines, refreshed incrementally.
+
+    Each timeline keeps a window of its newest rendered statuses. Timelines
+    often return fewer statuses than asked for (deleted tweets and filtered
+    retweets still count against `count`), so a full refresh pages down with
+    `max_id` until it holds the requested depth, a full-size request comes
+    back empty or `max_pages` requests were made. Within `ttl` a window
+    fetched at least as deep as a request is served without any request.
+    After that, it is refreshed with `since_id` just below its newest status
+    and paged down until that status (or nothing) comes back, so only tweets
+    posted since are fetched, and merged in front of the window. Windows are
+    trimmed to the `ring` newest statuses, and are dropped entirely once they
+    have not been refreshed for `retain` seconds.
+
+    Attributes:
+        client: TwitterClient (class `TwitterClient`)
+            Client the timeline calls run on.
+        render (callable): Turns a list of `Status` objects into `Embed` objects.
+        ring (int): Most statuses kept per timeline.
+        max_pages (int): Most requests made by one refresh.
+        cache: TTLCache (class `TTLCache`)
+            Windows by timeline, fresh for `ttl` and kept for `retain` seconds.
+        flights: SingleFlight (class `SingleFlight`)
+            Coalesces identical concurrent refreshes.
+        deltas (int): Refreshes answered with a `since_id` request.
+        full (int): Refreshes that fetched the whole window.
+    """
+
+    class Window:
+        """Newest statuses of a timeline.
+
+        Attributes:
+            statuses (list): `(status_id, embed)` tuples, newest first.
+            depth (int): Statuses the window was fetched for, `statuses` may be
+                        shorter when the timeline skipped some.
+            exhausted (bool): An empty page showed the timeline has no statuses
+                            older than the window.
+        """
+
+        __slots__ = ("statuses", "depth", "exhausted")
+
+        def __init__(self, statuses: list, depth: int, exhausted: bool):
+            self.statuses = statuses
+            self.depth = depth
+            self.exhausted = exhausted
+
+        def covers(self, count: int):
+            return count <= self.depth or self.exhausted
+
+        @property
+        def head(self):
+            return self.statuses[0][0] if self.statuses else None
+
+    def __init__(
+        self,
+        client,
+        render,
+        ring: int = STATUSES_PER_CALL,
+        ttl: float = 60.0,
+        retain: float = 3600.0,
+        maxsize: int = 128,
+        max_pages: int = 4,
+    ):
+        self.client = client
+        self.render = render
+        self.ring = ring
+        self.max_pages = max_pages
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl, stale_ttl=retain)
+        self.flights = SingleFlight()
+        self.deltas = 0
+        self.full = 0
+
+    async def embeds(
+        self, key: tuple, endpoint: str, timeline, count: int, app_only: bool = False
+    ):
+        """Return the newest `count` rendered statuses of a timeline.
+
+        Parameters:
+            key (tuple): Identifies the timeline, e.g. `("list", slug, include_rts)`.
+            endpoint (str): The timeline endpoint, e.g. "lists/statuses".
+            timeline (callable): Performs the Tweepy timeline call given a
+                                `tweepy.API`, `count`, `since_id` and `max_id`
+                                keywords.
+            count (int): Number of statuses wanted, at most `ring`.
+            app_only (bool): Default `False`, fetch a public timeline with
+                            `TwitterClient.read`.
+
+        Returns:
+            embeds (list): Up to `count` `Embed` objects, newest first.
+        """
+        count = max(min(count, self.ring), 1)
+        call = self.client.read if app_only else self.client.run
+        window = self.cache.get(key)
+        if window is None or not window.covers(count):
+
+            async def refresh():
+                current = self.cache.peek(key)
+                if current is not None and current.covers(count) and current.head:
+                    head = current.head
+                    fetched, max_id = [], None
+                    for _ in range(self.max_pages):
+                        # The head itself is included, seeing it (or nothing at
+                        # all) shows no tweets were skipped.
+                        page = await call(
+                            endpoint,
+                            self._fetch,
+                            timeline,
+                            STATUSES_PER_CALL,
+                            since_id=head - 1,
+                            max_id=max_id,
+                        )
+                        fetched.extend(x for x in page if x[0] > head)
+                        if not page or page[-1][0] <= head:
+                            self.deltas += 1
+                            merged = fetched + current.statuses
+                            refreshed = TimelineCache.Window(
+                                merged[: self.ring],
+                                min(current.depth + len(fetched), self.ring),
+                                current.exhausted and len(merged) <= self.ring,
+                            )
+                            self.cache.set(key, refreshed)
+                            return refreshed
+                        max_id = page[-1][0] - 1
+                    # Too many new tweets to page through, start over instead.
+                depth = max(count, current.depth if current else 0)
+                fetched, exhausted, max_id = [], False, None
+                for _ in range(self.max_pages):
+                    # Full pages, a short request can come back empty when every
+                    # status it covered was deleted or filtered out.
+                    page = await call(
+                        endpoint,
+                        self._fetch,
+                        timeline,
+                        STATUSES_PER_CALL,
+                        max_id=max_id,
+                    )
+                    if not page:
+                        exhausted = True
+                        break
+                    fetched.extend(page)
+                    if len(fetched) >= depth:
+                        break
+                    max_id = page[-1][0] - 1
+                self.full += 1
+                refreshed = TimelineCache.Window(fetched[:depth], depth, exhausted)
+                self.cache.set(key, refreshed)
+                return refreshed
+
+            window = await self.flights.do((key, count), refresh)
+        return [embed for _, embed in window.statuses[:count]]
+
+    def _fetch(
+        self, api, timeline, count: int, since_id: int = None, max_id: int = None
+    ):
+        """Fetch and render statuses. Runs on a Twitter worker.
+
+        Returns:
+            statuses (list): `(status_id, embed)` tuples, newest first.
+        """
+        statuses = timeline(api, count=count, since_id=since_id, max_id=max_id)
+        return [(x.id, embed) for x, embed in zip(statuses, self.render(statuses))]
+
+    def stats(self):
+        """Cache statistics.
+
+        Returns:
+            stats (dict): `TTLCache.stats()` with delta and full refreshes and
+                        coalesced requests.
+        """
+        return {
+            **self.cache.stats(),
+            "delta_refreshes": self.deltas,
+            "full_refreshes": self.full,
+            "coalesced": self.flights.coalesced,
+        }
@@ -1,11 +1,14 @@
 from datetime import datetime
 
 import discord
-import requests
 from discord.ext import commands
-from pyiqvia import Client
 
 import settings
+from cogs.utils.cache import TTLCache
+from cogs.utils.http import HTTPClient
+from cogs.utils.pages import EmbedPageSource, paginate
+from cogs.utils.ratelimit import RateLimitRegistry
+from cogs.utils.singleflight import SingleFlight
 
 
 class WeatherCog(commands.Cog):
@@ -17,11 +20,44 @@ class WeatherCog(commands.Cog):
     The `ctx` argument is treated as `self` for commands and is omitted from documentation.
     """
 
-    api_openweather = "&appid={api_key}".format(api_key=settings.OPENWEATHERMAP_API_KEY)
+    api_openweather = "http://api.openweathermap.org/data/2.5/{endpoint}"
     api_ambee = ""
 
     def __init__(self, bot):
+        """Weather bot extension.
+
+        Inherits the bot instance and opens a pooled HTTP client for weather APIs.
+
+        Attributes:
+            bot: BrandoBot (class `BrandoBot`)
+                Instance of the BrandoBot client.
+            http: HTTPClient (class `HTTPClient`)
+                Shared keep-alive session used for every OpenWeatherMap request.
+            cache: TTLCache (class `TTLCache`)
+                OpenWeatherMap responses keyed by endpoint and normalized location.
+            ttls: dict
+                Seconds each endpoint's responses stay fresh.
+            flights: SingleFlight (class `SingleFlight`)
+                Coalesces concurrent cache misses for the same location.
+            rate_limit: RateLimitBudget (class `RateLimitBudget`)
+                OpenWeatherMap calls counted against the plan's per-minute limit.
+        """
         self.bot = bot
+        self.http = HTTPClient(
+            limit_per_host=settings.OPENWEATHERMAP_MAX_CONNECTIONS,
+            total_timeout=settings.OPENWEATHERMAP_TIMEOUT,
+        )
+        self.cache = TTLCache(maxsize=settings.WEATHER_CACHE_SIZE)
+        self.ttls = {
+            "weather": settings.WEATHER_NOW_CACHE_TTL,
+            "forecast": settings.WEATHER_FORECAST_CACHE_TTL,
+        }
+        self.flights = SingleFlight()
+        self.rate_limit = RateLimitRegistry.for_bot(bot).budget("openweathermap", "api")
+
+    def cog_unload(self):
+        """Close the pooled HTTP client when the cog is removed."""
+        self.bot.loop.create_task(self.http.close())
 
     @commands.command()
     async def forecast(self, ctx, location: str, days: int = 1):
@@ -42,15 +78,10 @@ class WeatherCog(commands.Cog):
             * Fix UTC timestamp conversion to display proper, localized time.
             * Return 1 forecast object per day, not 8 (every 3 hours).
         """
-        forecast = "http://api.openweathermap.org/data/2.5/forecast?q={location}&units=imperial".format(
-            location=location
-        )
-        forecast += WeatherCog.api_openweather
-        api_call = requests.get(forecast)
-        weather = WeatherCog._format_forecast_data(api_call.json())
+        data = await self._openweather("forecast", location)
+        weather = WeatherCog._format_forecast_data(data)
 
-        for x in range(days):
-            await ctx.send(embed=weather[x])
+        await paginate(ctx, EmbedPageSource(weather[:days]))
 
     @commands.command()
     async def weather_now(self, ctx, location: str):
@@ -69,12 +100,8 @@ class WeatherCog(commands.Cog):
         TODO:
             * Fix UTC timestamp conversion to display proper, localized time.
         """
-        forecast = "http://api.openweathermap.org/data/2.5/weather?q={location}&units=imperial".format(
-            location=location
-        )
-        forecast += WeatherCog.api_openweather
-        api_call = requests.get(forecast)
-        weather = WeatherCog._format_weather_data(api_call.json())
+        data = await self._openweather("weather", location)
+        weather = WeatherCog._format_weather_data(data)
 
         await ctx.send(embed=weather)
 
@@ -91,25 +118,87 @@ class WeatherCog(commands.Cog):
             message (class Embed): The pollen index and allergen information
                                 (allergen name, genus, and plant type) for the day.
         """
+        # pyiqvia is only imported once pollen data is first requested.
+        from pyiqvia import Client
+
         client = Client(zip_code)
         data = await client.allergens.current()
         allergens = WeatherCog._format_pollen_data(data)
 
         await ctx.send(embed=allergens)
 
+    @commands.command(hidden=True)
+    async def weather_cache(self, ctx):
+        """Weather response cache statistics.
+
+        Returns:
+            message (class Message): Cache size, hits, stale hits, misses, evictions
+                                    and coalesced requests.
+        """
+        stats = {**self.cache.stats(), "coalesced": self.flights.coalesced}
+        stats = "\n".join(f"{k}: {v}" for k, v in stats.items())
+        await ctx.send(f"**Weather cache:**\n```{stats}```")
+
     @staticmethod
-    def _lat_lang(location: str):
-        forecast = "http://api.openweathermap.org/data/2.5/weather?q={location}&units=imperial".format(
-            location=location
+    def _normalize_location(location: str):
+        """Normalize a location so equivalent lookups share a cache key.
+
+        Parameters:
+            location (str): Location information as typed by the user.
+
+        Returns:
+            location (str): Case-folded location with consistent spacing around commas.
+        """
+        parts = [" ".join(x.split()) for x in location.casefold().split(",")]
+        return ",".join(x for x in parts if x)
+
+    async def _openweather(self, endpoint: str, location: str):
+        """Request an OpenWeatherMap endpoint for a location.
+
+        Responses are cached per endpoint and normalized location. Stale
+        responses are served immediately and refreshed in the background.
+
+        Parameters:
+            endpoint (str): The API endpoint, "weather" or "forecast".
+            location (str): Location information (city/state, zip code, lat/long).
+
+        Returns:
+            data (dict): The decoded JSON response.
+        """
+        location = WeatherCog._normalize_location(location)
+        params = {
+            "q": location,
+            "units": "imperial",
+            "appid": settings.OPENWEATHERMAP_API_KEY,
+        }
+
+        key = (endpoint, location)
+
+        async def request():
+            # OpenWeatherMap sends no rate-limit headers, calls are counted locally.
+            self.rate_limit.record(settings.OPENWEATHERMAP_RATE_LIMIT, 60)
+            return await self.http.get_json(
+                WeatherCog.api_openweather.format(endpoint=endpoint), params=params
+            )
+
+        async def fetch():
+            return await self.flights.do(key, request)
+
+        return await self.cache.get_or_fetch(key, fetch, ttl=self.ttls.get(endpoint))
+
+    async def _lat_lang(self, location: str):
+        # Coordinates never change, reuse any cached forecast before calling out.
+        forecast = self.cache.peek(
+            ("forecast", WeatherCog._normalize_location(location))
         )
-        forecast += WeatherCog.api_openweather
-        api_call = requests.get(forecast)
-        weather = api_call.json()
-        coords = {
-            "latitude": weather["coord"]["lat"],
-            "longitude": weather["coord"]["lon"],
+        if forecast is not None:
+            coords = forecast["city"]["coord"]
+        else:
+            coords = (await self._openweather("weather", location))["coord"]
+        return {
+            "latitude": coords["lat"],
+            "longitude": coords["lon"],
         }
-        return coords
 
     @staticmethod
     def _format_forecast_data(data):
@@ -252,3 +341,8 @@ class WeatherCog(commands.Cog):
             text=f"Use `!help weathercog` to see more!  |  {datetime.now()}"
         )
         return embed
+
+
+def setup(bot):
+    """Extension entry point, called by `bot.load_extension`."""
+    bot.add_cog(WeatherCog(bot))
@@ -16,6 +16,17 @@ load_dotenv(ENV_PATH)
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
 DISCORD_GUILD = os.getenv("DISCORD_GUILD")
 DISCORD_GUILD_ID = int(os.getenv("DISCORD_GUILD_ID"))
+# "full", "seen" (members who used a command) or "none" (fetch on demand)
+MEMBER_CACHE_POLICY = os.getenv("MEMBER_CACHE_POLICY", "full")
+
+# Cogs loaded at startup, modules under `cogs/`
+ENABLED_COGS = [
+    x.strip()
+    for x in os.getenv("ENABLED_COGS", "general,twitter,reddit,weather").split(",")
+    if x.strip()
+]
+# Cold start budget checked by `python -m benchmarks.startup`
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", 1500))
 
 # Twitter secrets
 TWITTER_API_KEY = os.getenv("TWITTER_API_KEY")
@@ -23,6 +34,31 @@ TWITTER_API_SECRET_KEY = os.getenv("TWITTER_API_SECRET_KEY")
 TWITTER_ACCESS_TOKEN = os.getenv("TWITTER_ACCESS_TOKEN")
 TWITTER_ACCESS_TOKEN_SECRET = os.getenv("TWITTER_ACCESS_TOKEN_SECRET")
 BEARER_TOKEN = os.getenv("BEARER_TOKEN")
+# App-only tokens for public reads, `BEARER_TOKEN` then any comma separated extras
+TWITTER_BEARER_TOKENS = [BEARER_TOKEN or ""]
+TWITTER_BEARER_TOKENS += os.getenv("TWITTER_BEARER_TOKENS", "").split(",")
+TWITTER_BEARER_TOKENS = list(
+    dict.fromkeys(x.strip() for x in TWITTER_BEARER_TOKENS if x.strip())
+)
+TWITTER_MAX_WORKERS = int(os.getenv("TWITTER_MAX_WORKERS", 4))
+TWITTER_RATE_LIMIT_MAX_WAIT = float(os.getenv("TWITTER_RATE_LIMIT_MAX_WAIT", 30))
+TWITTER_TIMELINE_CACHE_SIZE = int(os.getenv("TWITTER_TIMELINE_CACHE_SIZE", 128))
+TWITTER_TIMELINE_CACHE_TTL = float(os.getenv("TWITTER_TIMELINE_CACHE_TTL", 60))
+TWITTER_TIMELINE_CACHE_RETAIN = float(os.getenv("TWITTER_TIMELINE_CACHE_RETAIN", 3600))
+TWITTER_FEED_MIN_INTERVAL = float(os.getenv("TWITTER_FEED_MIN_INTERVAL", 60))
+TWITTER_FEED_MAX_INTERVAL = float(os.getenv("TWITTER_FEED_MAX_INTERVAL", 900))
+TWITTER_LIST_CONCURRENCY = int(os.getenv("TWITTER_LIST_CONCURRENCY", 2))
+TWITTER_EXPIRE_CONCURRENCY = int(os.getenv("TWITTER_EXPIRE_CONCURRENCY", 4))
+TWITTER_EXPIRE_PROGRESS_INTERVAL = float(
+    os.getenv("TWITTER_EXPIRE_PROGRESS_INTERVAL", 5)
+)
+# Local SQLite index of the account's tweets, empty to page the timeline instead
+TWITTER_ARCHIVE_PATH = os.getenv(
+    "TWITTER_ARCHIVE_PATH", join(ROOT_DIR, "data/timeline.sqlite3")
+)
+TWITTER_EXPIRE_CHECKPOINT = os.getenv(
+    "TWITTER_EXPIRE_CHECKPOINT", join(ROOT_DIR, "data/expire_tweets.json")
+)
 
 # Reddit secrets
 REDDIT_CLIENT_ID = os.getenv("REDDIT_CLIENT_ID")
@@ -30,9 +66,25 @@ REDDIT_CLIENT_SECRET = os.getenv("REDDIT_CLIENT_SECRET")
 REDDIT_USERNAME = os.getenv("REDDIT_USERNAME")
 REDDIT_PASSWORD = os.getenv("REDDIT_PASSWORD")
 REDDIT_USER_AGENT = os.getenv("REDDIT_USER_AGENT")
+REDDIT_MAX_WORKERS = int(os.getenv("REDDIT_MAX_WORKERS", 4))
+REDDIT_STREAM_INTERVAL = float(os.getenv("REDDIT_STREAM_INTERVAL", 30))
+REDDIT_STREAM_SEEN_SIZE = int(os.getenv("REDDIT_STREAM_SEEN_SIZE", 1000))
+REDDIT_LISTING_CACHE_SIZE = int(os.getenv("REDDIT_LISTING_CACHE_SIZE", 128))
+REDDIT_COMMENT_PAGE_SIZE = int(os.getenv("REDDIT_COMMENT_PAGE_SIZE", 10))
+REDDIT_COMMENT_FETCH_LIMIT = int(os.getenv("REDDIT_COMMENT_FETCH_LIMIT", 50))
+REDDIT_COMMENT_MORE_BUDGET = int(os.getenv("REDDIT_COMMENT_MORE_BUDGET", 5))
 
 # OpenWeatherMap secrets
 OPENWEATHERMAP_API_KEY = os.getenv("OPENWEATHERMAP_API_KEY")
+OPENWEATHERMAP_TIMEOUT = float(os.getenv("OPENWEATHERMAP_TIMEOUT", 10))
+OPENWEATHERMAP_MAX_CONNECTIONS = int(os.getenv("OPENWEATHERMAP_MAX_CONNECTIONS", 10))
+# Calls per minute allowed by the OpenWeatherMap plan
+OPENWEATHERMAP_RATE_LIMIT = int(os.getenv("OPENWEATHERMAP_RATE_LIMIT", 60))
+
+# Weather cache
+WEATHER_CACHE_SIZE = int(os.getenv("WEATHER_CACHE_SIZE", 256))
+WEATHER_NOW_CACHE_TTL = float(os.getenv("WEATHER_NOW_CACHE_TTL", 600))
+WEATHER_FORECAST_CACHE_TTL = float(os.getenv("WEATHER_FORECAST_CACHE_TTL", 3600))
 
 # Ambee secrets
 AMBEE_API_KEY = os.getenv("AMBEE_API_KEY")